@@ -0,0 +1,145 @@
+"""
+Command-line tools for operating DHAN-DRAFT.
+
+Run from the backend directory, e.g.:
+    python -m app.cli backtest --workers 4 --horizon 1
+    python -m app.cli synth --symbols 2000 --years 20 --seed 42 --npz market.npz
+    python -m app.cli ingest news.ndjson --batch-size 2000
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+
+from . import database
+from .services.backtest import default_workers, load_close_history, run_backtest
+from .services.ingest import ingest_ndjson
+from .services.synthetic import generate_market, load_npz, populate_mongo, save_npz
+from .utils.http_cache import content_versions
+
+logger = logging.getLogger(__name__)
+
+
+async def _backtest(args):
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()] if args.symbols else None
+    if args.npz:
+        series = load_npz(args.npz).close_series()
+        if symbols:
+            series = {s: closes for s, closes in series.items() if s in symbols}
+    else:
+        await database.connect_db()
+        try:
+            series = await load_close_history(database.get_db(), symbols)
+        finally:
+            await database.close_db()
+    return run_backtest(series, args.horizon, args.neutral_band, args.workers, args.per_symbol)
+
+
+def _add_backtest_parser(subparsers):
+    p = subparsers.add_parser("backtest", help="Backtest the SMA/momentum predictor over stored history")
+    p.add_argument("--horizon", type=int, default=1, help="Bars ahead used as the realised direction")
+    p.add_argument("--neutral-band", type=float, default=0.0, help="Moves within +/- this percent count as neutral")
+    p.add_argument("--workers", type=int, default=default_workers(), help="Process pool size")
+    p.add_argument("--symbols", default=None, help="Comma-separated symbols (default: all)")
+    p.add_argument("--per-symbol", action="store_true", help="Include per-symbol hit rates")
+    p.add_argument("--npz", default=None, help="Read history from a .npz store instead of Mongo")
+    p.set_defaults(handler=_backtest)
+
+
+async def _synth(args):
+    started = time.perf_counter()
+    market = generate_market(args.symbols, args.years, seed=args.seed)
+    generated = time.perf_counter() - started
+    bars = market.n_days * market.n_symbols
+
+    summary = {
+        "symbols": market.n_symbols,
+        "days": market.n_days,
+        "bars": bars,
+        "seed": args.seed,
+        "generateMs": round(generated * 1000, 2),
+        "barsPerSecond": round(bars / generated) if generated > 0 else 0,
+    }
+
+    if args.npz:
+        save_npz(market, args.npz)
+        summary["npz"] = args.npz
+
+    if args.mongo:
+        await database.connect_db()
+        try:
+            started = time.perf_counter()
+            summary["mongoDocuments"] = await populate_mongo(
+                database.get_db(), market, args.history_days, replace=not args.append
+            )
+            summary["mongoMs"] = round((time.perf_counter() - started) * 1000, 2)
+            # Let running API workers revalidate their cached stock responses
+            content_versions.bump("stocks")
+            await content_versions.sync()
+        finally:
+            await database.close_db()
+    return summary
+
+
+def _add_synth_parser(subparsers):
+    p = subparsers.add_parser("synth", help="Generate a synthetic market for scale testing")
+    p.add_argument("--symbols", type=int, default=500, help="Number of symbols")
+    p.add_argument("--years", type=float, default=10, help="Years of daily bars")
+    p.add_argument("--seed", type=int, default=None, help="Seed for reproducible output")
+    p.add_argument("--npz", default=None, help="Write the market to this .npz history store")
+    p.add_argument("--mongo", action="store_true", help="Insert the market into the stocks collection")
+    p.add_argument("--history-days", type=int, default=None, help="Bars kept per Mongo document (default: all)")
+    p.add_argument("--append", action="store_true", help="Keep previously generated synthetic stocks")
+    p.set_defaults(handler=_synth)
+
+
+async def _read_chunks(path: str, chunk_size: int = 1 << 20):
+    f = sys.stdin.buffer if path == "-" else open(path, "rb")
+    try:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        if f is not sys.stdin.buffer:
+            f.close()
+
+
+async def _ingest(args):
+    await database.connect_db()
+    try:
+        report = await ingest_ndjson(_read_chunks(args.path), args.batch_size)
+        await content_versions.sync()
+    finally:
+        await database.close_db()
+    if not args.batches:
+        report.pop("batches")
+    return report
+
+
+def _add_ingest_parser(subparsers):
+    p = subparsers.add_parser("ingest", help="Bulk-ingest NDJSON news into Mongo")
+    p.add_argument("path", help="NDJSON file, one article per line ('-' for stdin)")
+    p.add_argument("--batch-size", type=int, default=None, help="Items per insert batch (default: INGEST_BATCH_SIZE)")
+    p.add_argument("--batches", action="store_true", help="Include per-batch throughput in the report")
+    p.set_defaults(handler=_ingest)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="DHAN-DRAFT command-line tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    _add_backtest_parser(subparsers)
+    _add_synth_parser(subparsers)
+    _add_ingest_parser(subparsers)
+
+    args = parser.parse_args(argv)
+    result = asyncio.run(args.handler(args))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -32,6 +32,89 @@ class Settings:
     # Alpha Vantage (optional - leave empty to use DB seed data)
     ALPHA_VANTAGE_API_KEY: str = (os.environ.get('ALPHA_VANTAGE_API_KEY') or '').strip()
     
+    # Admin access (comma-separated emails allowed to use /api/admin endpoints)
+    ADMIN_EMAILS: str = os.environ.get('ADMIN_EMAILS', '')
+    
+    # Backtesting (process pool size for the admin endpoint)
+    BACKTEST_WORKERS: int = int(os.environ.get('BACKTEST_WORKERS', '1'))
+    
+    # Conditional GET: how often content versions are pushed to / read from Mongo
+    CONTENT_VERSION_SYNC_SECONDS: float = float(os.environ.get('CONTENT_VERSION_SYNC_SECONDS', '2'))
+    
+    # Live prices: feed refresh period, WebSocket frame coalescing and subscription cap
+    PRICE_POLL_SECONDS: float = float(os.environ.get('PRICE_POLL_SECONDS', '15'))
+    PRICE_FRAME_INTERVAL_MS: int = int(os.environ.get('PRICE_FRAME_INTERVAL_MS', '250'))
+    PRICE_MAX_SUBSCRIPTIONS: int = int(os.environ.get('PRICE_MAX_SUBSCRIPTIONS', '200'))
+    # Full heatmap rebuild period (picks up added and deleted stocks)
+    HEATMAP_RELOAD_SECONDS: float = float(os.environ.get('HEATMAP_RELOAD_SECONDS', '300'))
+    
+    # WebSocket fan-out: per-connection send queue size and what to do when it is full
+    # ("drop_oldest" discards the oldest droppable queued frame, "disconnect" closes the client)
+    WS_SEND_QUEUE_SIZE: int = int(os.environ.get('WS_SEND_QUEUE_SIZE', '256'))
+    WS_SLOW_CONSUMER_POLICY: str = os.environ.get('WS_SLOW_CONSUMER_POLICY', 'drop_oldest')
+    # Heartbeats: ping every WS_HEARTBEAT_SECONDS, reap connections silent for WS_IDLE_TIMEOUT_SECONDS
+    WS_HEARTBEAT_SECONDS: float = float(os.environ.get('WS_HEARTBEAT_SECONDS', '20'))
+    WS_IDLE_TIMEOUT_SECONDS: float = float(os.environ.get('WS_IDLE_TIMEOUT_SECONDS', '60'))
+    # Connection caps: per user per endpoint, and across all endpoints of a worker
+    WS_MAX_CONNECTIONS_PER_USER: int = int(os.environ.get('WS_MAX_CONNECTIONS_PER_USER', '5'))
+    WS_MAX_CONNECTIONS: int = int(os.environ.get('WS_MAX_CONNECTIONS', '10000'))
+    
+    # Community chat: recent messages kept in memory per room
+    CHAT_HISTORY_SIZE: int = int(os.environ.get('CHAT_HISTORY_SIZE', '50'))
+    CHAT_MAX_ROOMS_PER_CONNECTION: int = int(os.environ.get('CHAT_MAX_ROOMS_PER_CONNECTION', '10'))
+    
+    # Write-behind batching for append-only collections (comma-separated opt-in list).
+    # Leave out collections whose writes are read back right away: advisor chat_history
+    # (overview insight), predictions (history page, stats backfill).
+    WRITE_BEHIND_COLLECTIONS: str = os.environ.get('WRITE_BEHIND_COLLECTIONS', 'community_chat')
+    WRITE_BEHIND_FLUSH_MS: int = int(os.environ.get('WRITE_BEHIND_FLUSH_MS', '200'))
+    WRITE_BEHIND_MAX_BATCH: int = int(os.environ.get('WRITE_BEHIND_MAX_BATCH', '500'))
+    WRITE_BEHIND_MAX_RETRIES: int = int(os.environ.get('WRITE_BEHIND_MAX_RETRIES', '5'))
+    WRITE_BEHIND_MAX_PENDING: int = int(os.environ.get('WRITE_BEHIND_MAX_PENDING', '20000'))
+    # After a failed flush, wait flush interval x 2^failures (capped) before the next one
+    WRITE_BEHIND_MAX_BACKOFF_MS: int = int(os.environ.get('WRITE_BEHIND_MAX_BACKOFF_MS', '30000'))
+    
+    # Token-bucket rate limits: "memory" (per process) or "mongo" (shared by every worker).
+    # Idle keys are evicted after RATE_LIMIT_IDLE_SECONDS (never before their bucket refills).
+    RATE_LIMIT_BACKEND: str = os.environ.get('RATE_LIMIT_BACKEND', 'memory')
+    RATE_LIMIT_IDLE_SECONDS: float = float(os.environ.get('RATE_LIMIT_IDLE_SECONDS', '600'))
+    CHAT_RATE_PER_SECOND: float = float(os.environ.get('CHAT_RATE_PER_SECOND', '0.5'))
+    CHAT_RATE_BURST: float = float(os.environ.get('CHAT_RATE_BURST', '3'))
+    # Expensive REST routes (advisor, predictions, risk checks, admin jobs)
+    API_RATE_PER_SECOND: float = float(os.environ.get('API_RATE_PER_SECOND', '0.2'))
+    API_RATE_BURST: float = float(os.environ.get('API_RATE_BURST', '10'))
+    
+    # Broadcast bus: "memory" (single process) or "mongo" (capped collection tailed by every worker)
+    PUBSUB_BACKEND: str = os.environ.get('PUBSUB_BACKEND', 'memory')
+    PUBSUB_CAPPED_BYTES: int = int(os.environ.get('PUBSUB_CAPPED_BYTES', str(16 * 1024 * 1024)))
+    
+    # Prediction leaderboard: ranking refresh period and minimum predictions to qualify
+    LEADERBOARD_REFRESH_SECONDS: float = float(os.environ.get('LEADERBOARD_REFRESH_SECONDS', '300'))
+    LEADERBOARD_MIN_PREDICTIONS: int = int(os.environ.get('LEADERBOARD_MIN_PREDICTIONS', '5'))
+    
+    # Sentiment: optional weighted lexicon JSON replacing the built-in keyword lists
+    SENTIMENT_LEXICON_PATH: str = os.environ.get('SENTIMENT_LEXICON_PATH', '')
+    
+    # Crowd-vs-AI consensus: refresh period and lag behind now for late writes
+    CONSENSUS_REFRESH_SECONDS: float = float(os.environ.get('CONSENSUS_REFRESH_SECONDS', '60'))
+    CONSENSUS_LAG_SECONDS: float = float(os.environ.get('CONSENSUS_LAG_SECONDS', '30'))
+    
+    # Background jobs: alert detection period, schedule jitter fraction
+    ALERT_DETECT_SECONDS: float = float(os.environ.get('ALERT_DETECT_SECONDS', '30'))
+    SCHEDULER_JITTER: float = float(os.environ.get('SCHEDULER_JITTER', '0.1'))
+    
+    # Alert subscriptions: most sectors + symbols one alerts connection may filter on
+    ALERT_FILTER_MAX_KEYS: int = int(os.environ.get('ALERT_FILTER_MAX_KEYS', '100'))
+    
+    # News ingestion: items parsed, scored and inserted per batch
+    INGEST_BATCH_SIZE: int = int(os.environ.get('INGEST_BATCH_SIZE', '1000'))
+    # Sector sentiment strip: daily buckets averaged, and shared window cache lifetime
+    SECTOR_SENTIMENT_WINDOW_DAYS: int = int(os.environ.get('SECTOR_SENTIMENT_WINDOW_DAYS', '30'))
+    SECTOR_SENTIMENT_CACHE_SECONDS: float = float(os.environ.get('SECTOR_SENTIMENT_CACHE_SECONDS', '60'))
+    
+    # Near-duplicate threshold in SimHash bits (at most 6 with the banded index)
+    SIMHASH_MAX_DISTANCE: int = int(os.environ.get('SIMHASH_MAX_DISTANCE', '6'))
+    
     def __init__(self):
         """Initialize and validate settings."""
         # Warn about default JWT secret
@@ -62,6 +145,16 @@ class Settings:
     def cors_origins_list(self) -> list:
         """Convert CORS_ORIGINS string to list."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(',')]
+    
+    @property
+    def write_behind_collections_list(self) -> list:
+        """Convert WRITE_BEHIND_COLLECTIONS string to a list."""
+        return [c.strip() for c in self.WRITE_BEHIND_COLLECTIONS.split(',') if c.strip()]
+    
+    @property
+    def admin_emails_list(self) -> list:
+        """Convert ADMIN_EMAILS string to a lowercase list."""
+        return [email.strip().lower() for email in self.ADMIN_EMAILS.split(',') if email.strip()]
 
 
 settings = Settings()
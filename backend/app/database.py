@@ -47,6 +47,16 @@ async def create_indexes():
         # Predictions collection (sorted by timestamp, paginated)
         await db.predictions.create_index([("userId", 1), ("timestamp", -1)])
         await db.predictions.create_index("stockSymbol")
+        await db.predictions.create_index("timestamp")
+        # Stats backfill scans only predictions made before per-user stats
+        await db.predictions.create_index([("statsCounted", 1), ("userId", 1), ("timestamp", 1)])
+        
+        # Prediction stats (one document per user, point lookups)
+        await db.prediction_stats.create_index("userId", unique=True)
+        
+        # Consensus daily view (read by day window, optionally per symbol)
+        await db.symbol_consensus_daily.create_index([("symbol", 1), ("day", -1)])
+        await db.symbol_consensus_daily.create_index("day")
         
         # Quiz scores (sorted by completedAt)
         await db.quiz_scores.create_index([("userId", 1), ("completedAt", -1)])
@@ -58,9 +68,17 @@ async def create_indexes():
         # Alerts (filtered by is_read, sorted by created_at, paginated)
         await db.alerts.create_index([("is_read", 1), ("created_at", -1)])
         await db.alerts.create_index("created_at")
+        await db.alerts.create_index("title")
+        # One alert per source news item; legacy alerts without it are not constrained
+        await db.alerts.create_index(
+            "sourceNewsId",
+            unique=True,
+            partialFilterExpression={"sourceNewsId": {"$exists": True}}
+        )
         
         # Community chat (sorted by timestamp, with TTL)
         await db.community_chat.create_index([("timestamp", -1)])
+        await db.community_chat.create_index([("room", 1), ("timestamp", -1)])
         # TTL index: auto-delete messages older than 30 days
         await db.community_chat.create_index(
             "timestamp", 
@@ -68,6 +86,9 @@ async def create_indexes():
             name="ttl_community_chat"
         )
         
+        # Shared rate-limit buckets, removed once idle
+        await db.rate_limits.create_index("expiresAt", expireAfterSeconds=0)
+        
         # Stocks collection
         await db.stocks.create_index("symbol", unique=True)
         
@@ -76,6 +97,25 @@ async def create_indexes():
         
         # News collection
         await db.news.create_index("date")
+        await db.news.create_index("id")
+        await db.news.create_index("scorerVersion")
+        # SimHash band keys (multikey) for near-duplicate candidate lookup
+        await db.news.create_index("simhashBands")
+        await db.news.create_index("duplicateOf")
+        # Alert detection scans items not yet checked
+        await db.news.create_index("alertChecked")
+        # Entity links (multikey) behind the per-symbol news feed
+        await db.news.create_index([("symbols", 1), ("date", -1), ("ingestedAt", -1)])
+        # Ingestion dedupe; seeded items without a hash are not constrained
+        await db.news.create_index(
+            "contentHash",
+            unique=True,
+            partialFilterExpression={"contentHash": {"$exists": True}}
+        )
+        
+        # Sector sentiment buckets (latest bucket lookup and window scans)
+        await db.sector_sentiment.create_index([("granularity", 1), ("bucket", -1)])
+        await db.sector_sentiment.create_index([("granularity", 1), ("sector", 1), ("bucket", -1)])
         
         logger.info("✓ All indexes created successfully")
         
@@ -5,14 +5,32 @@ from starlette.middleware.cors import CORSMiddleware
 
 from .config import settings
 from .database import connect_db, close_db
+from .middleware.conditional import ConditionalGetMiddleware
+from .middleware.rate_limit import RateLimitMiddleware
+from .utils.http_cache import content_versions
 from .utils.seed import seed_demo_data
+from .services.prices import price_book, refresh_prices
+from .services.heatmap import sector_heatmap, load_heatmap
+from .services.leaderboard import refresh_leaderboard
+from .services.predictions import backfill_prediction_stats
+from .services.consensus import refresh_consensus
+from .services.alerts import HOLDINGS_CHANNEL, detect_alerts
+from .services.scheduler import scheduler
+from .services.pubsub import bus
+from .services.chat_history import chat_history
+from .services.write_behind import write_behind
+from .services.news import rescore_stale_news
+from .services.entities import link_untagged_news
+from .services.sector_sentiment import ensure_sector_sentiment
 
 # Import routers
-from .routes import auth, overview, learn, markets, portfolio, risk, advisor, alerts, community
+from .routes import auth, overview, learn, markets, portfolio, risk, advisor, alerts, community, admin
 
 # Import WebSocket handlers
-from .websockets.alerts import alerts_websocket_handler
+from .websockets.alerts import alerts_websocket_handler, refresh_holdings_filters
 from .websockets.chat import chat_websocket_handler
+from .websockets.prices import prices_websocket_handler
+from .websockets.managers import alert_manager, chat_manager, price_manager
 
 # Configure logging
 logging.basicConfig(
@@ -28,7 +46,15 @@ app = FastAPI(
     version="2.0.0"
 )
 
-# Add CORS middleware
+# Middleware added later wraps middleware added earlier
+
+# ETag / If-None-Match handling for shared, versioned content
+app.add_middleware(ConditionalGetMiddleware)
+
+# Token-bucket limits on expensive REST routes
+app.add_middleware(RateLimitMiddleware)
+
+# Add CORS middleware last so it is outermost: 429 and 304 responses carry CORS headers too
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -49,6 +75,7 @@ app.include_router(risk.router, prefix=API_PREFIX)
 app.include_router(advisor.router, prefix=API_PREFIX)
 app.include_router(alerts.router, prefix=API_PREFIX)
 app.include_router(community.router, prefix=API_PREFIX)
+app.include_router(admin.router, prefix=API_PREFIX)
 
 
 # WebSocket endpoints
@@ -64,6 +91,31 @@ async def websocket_chat(websocket: WebSocket):
     await chat_websocket_handler(websocket)
 
 
+@app.websocket("/api/ws/prices")
+async def websocket_prices(websocket: WebSocket):
+    """WebSocket endpoint for live price streaming."""
+    await prices_websocket_handler(websocket)
+
+
+def register_jobs():
+    """Periodic and one-off background work, run by the in-process scheduler."""
+    jitter = settings.SCHEDULER_JITTER
+    scheduler.add("prices", refresh_prices, settings.PRICE_POLL_SECONDS)
+    # Already loaded at startup, so the first rebuild waits one period
+    scheduler.add(
+        "heatmap", load_heatmap, settings.HEATMAP_RELOAD_SECONDS, jitter,
+        initial_delay=settings.HEATMAP_RELOAD_SECONDS,
+    )
+    scheduler.add("alerts", detect_alerts, settings.ALERT_DETECT_SECONDS, jitter)
+    scheduler.add("leaderboard", refresh_leaderboard, settings.LEADERBOARD_REFRESH_SECONDS, jitter)
+    scheduler.add("consensus", refresh_consensus, settings.CONSENSUS_REFRESH_SECONDS, jitter)
+    # One-off backfills: news scored by an older lexicon, news stored before entity linking,
+    # predictions made before per-user stats
+    scheduler.add("rescore-news", rescore_stale_news, once=True)
+    scheduler.add("link-news", link_untagged_news, once=True)
+    scheduler.add("prediction-stats", backfill_prediction_stats, once=True)
+
+
 # Startup and shutdown events
 @app.on_event("startup")
 async def startup_event():
@@ -75,6 +127,28 @@ async def startup_event():
         logger.info("Alpha Vantage: disabled (using DB seed data)")
     await connect_db()
     await seed_demo_data()
+    # Shared ETag versions, so other workers' and CLI writes invalidate cached responses
+    content_versions.start()
+    
+    # Live prices: feed -> price book -> materialized heatmap + coalesced WebSocket frames
+    await load_heatmap()
+    await ensure_sector_sentiment()
+    price_book.add_listener(sector_heatmap.on_price_change)
+    price_book.add_listener(price_manager.publish)
+    price_book.add_listener(lambda *_: content_versions.bump("stocks"))
+    price_manager.start()
+    # Alerts and chat reach clients on every worker through the bus
+    bus.subscribe("alerts", alert_manager.publish_alerts)
+    bus.subscribe(HOLDINGS_CHANNEL, refresh_holdings_filters)
+    alert_manager.start()
+    write_behind.start()
+    await chat_history.load()
+    bus.subscribe("chat", chat_history.on_broadcast)
+    bus.subscribe("chat", chat_manager.broadcast)
+    chat_manager.start()
+    await bus.start()
+    register_jobs()
+    scheduler.start()
     logger.info("✅ Application started successfully")
 
 
@@ -82,6 +156,14 @@ async def startup_event():
 async def shutdown_event():
     """Close database connection."""
     logger.info("Shutting down...")
+    await scheduler.stop()
+    await bus.stop()
+    await price_manager.stop()
+    await chat_manager.stop()
+    await alert_manager.stop()
+    # Drain buffered inserts before the connection goes away
+    await write_behind.stop()
+    await content_versions.stop()
     await close_db()
     logger.info("✅ Application shutdown complete")
 
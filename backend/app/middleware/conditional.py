@@ -0,0 +1,96 @@
+"""Conditional GET middleware - ETag / If-None-Match and Cache-Control for shared content."""
+import re
+from email.utils import parsedate_to_datetime
+from typing import List, Tuple
+
+import jwt
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from ..config import settings
+from ..utils.http_cache import content_versions
+
+# (path pattern, content version keys, Cache-Control) for responses that are
+# identical for every user between data refreshes. Only routes whose data
+# is bumped by every write path belong here: versions persist in Mongo
+# across deploys, so content that changes with the code would stay 304.
+CACHEABLE_ROUTES: List[Tuple[re.Pattern, Tuple[str, ...], str]] = [
+    (re.compile(r"^/api/markets/stocks$"), ("stocks",), "public, max-age=5, s-maxage=15"),
+    (re.compile(r"^/api/markets/heatmap$"), ("heatmap",), "public, max-age=5, s-maxage=15"),
+    (re.compile(r"^/api/markets/sentiment$"), ("news",), "public, max-age=30, s-maxage=60"),
+    (re.compile(r"^/api/markets/sentiment/trend$"), ("sector-sentiment",), "public, max-age=30, s-maxage=60"),
+    (re.compile(r"^/api/markets/stocks/[^/]+/news$"), ("news",), "public, max-age=30, s-maxage=60"),
+]
+
+
+def _match(path: str):
+    for pattern, keys, cache_control in CACHEABLE_ROUTES:
+        if pattern.match(path):
+            return keys, cache_control
+    return None
+
+
+def _token_valid(request: Request) -> bool:
+    """Cheap signature check so 304s are only given to authenticated clients."""
+    auth_header = request.headers.get("Authorization", "")
+    if not auth_header.startswith("Bearer "):
+        return False
+    try:
+        jwt.decode(auth_header[7:], settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+        return True
+    except jwt.InvalidTokenError:
+        return False
+
+
+def _not_modified(request: Request, etag: str, keys) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since."""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return since is not None and content_versions.last_modified(keys) <= since
+    return False
+
+
+class ConditionalGetMiddleware(BaseHTTPMiddleware):
+    """
+    Answer revalidation requests for versioned content with 304 before the handler runs.
+
+    Full responses get ETag, Last-Modified and Cache-Control headers. The
+    ETag is only attached when the content version did not move while the
+    handler was running, so a tag never describes a different body.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        if request.method not in ("GET", "HEAD"):
+            return await call_next(request)
+
+        matched = _match(request.url.path)
+        if matched is None:
+            return await call_next(request)
+
+        keys, cache_control = matched
+        # Scoped to path and query, so routes that gain filter parameters stay correct
+        scope = f"{request.url.path}?{request.url.query}"
+        etag = content_versions.etag(keys, scope)
+        headers = {
+            "ETag": etag,
+            "Last-Modified": content_versions.last_modified_header(keys),
+            "Cache-Control": cache_control,
+        }
+
+        if _not_modified(request, etag, keys) and _token_valid(request):
+            return Response(status_code=304, headers=headers)
+
+        response = await call_next(request)
+        if response.status_code == 200 and content_versions.etag(keys, scope) == etag:
+            response.headers.update(headers)
+        return response
@@ -0,0 +1,60 @@
+"""Rate limiting middleware for expensive REST routes."""
+import math
+import re
+from typing import List, Tuple
+
+import jwt
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from ..config import settings
+from ..services.rate_limit import TokenBucketLimiter, api_limiter
+
+# (route name, method, path pattern, limiter, token cost) for routes that do heavy work per call;
+# each route name has its own bucket per client
+RATE_LIMITED_ROUTES: List[Tuple[str, str, re.Pattern, TokenBucketLimiter, float]] = [
+    ("advisor", "POST", re.compile(r"^/api/advisor/analyze$"), api_limiter, 1),
+    ("predict", "POST", re.compile(r"^/api/markets/predict$"), api_limiter, 1),
+    ("risk", "POST", re.compile(r"^/api/risk/(transaction|fraud)$"), api_limiter, 1),
+    ("backtest", "POST", re.compile(r"^/api/admin/backtest$"), api_limiter, 5),
+    ("ingest", "POST", re.compile(r"^/api/admin/news/ingest$"), api_limiter, 5),
+]
+
+
+def _match(method: str, path: str):
+    for name, route_method, pattern, limiter, cost in RATE_LIMITED_ROUTES:
+        if route_method == method and pattern.match(path):
+            return name, limiter, cost
+    return None
+
+
+def _client_key(request: Request) -> str:
+    """User id from a valid token, else the client address."""
+    auth_header = request.headers.get("Authorization", "")
+    if auth_header.startswith("Bearer "):
+        try:
+            payload = jwt.decode(auth_header[7:], settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+            return f"user:{payload['uid']}"
+        except (jwt.InvalidTokenError, KeyError):
+            pass
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """Answer 429 with Retry-After once a client has spent its tokens for a limited route."""
+
+    async def dispatch(self, request: Request, call_next):
+        matched = _match(request.method, request.url.path)
+        if matched is None:
+            return await call_next(request)
+
+        name, limiter, cost = matched
+        allowed, retry_after = await limiter.allow(f"{name}:{_client_key(request)}", cost)
+        if not allowed:
+            return JSONResponse(
+                status_code=429,
+                content={"detail": "Too many requests"},
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+        return await call_next(request)
@@ -0,0 +1,87 @@
+"""Admin routes - operational tools restricted to ADMIN_EMAILS."""
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
+
+from ..config import settings
+from ..services.auth import get_admin_user
+from ..services.backtest import load_close_history, run_backtest
+from ..services.ingest import ingest_ndjson
+from ..services.pubsub import bus
+from ..services.rate_limit import rate_limit_metrics
+from ..services.scheduler import scheduler
+from ..services.write_behind import write_behind
+from ..websockets.managers import connection_limits, websocket_metrics
+from ..database import get_db
+from ..utils.responses import success_response
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.post("/backtest")
+async def backtest_predictor(
+    user=Depends(get_admin_user),
+    horizon: int = Query(1, ge=1, le=60),
+    neutral_band: float = Query(0.0, ge=0, le=10),
+    workers: Optional[int] = Query(None, ge=1, le=32),
+    symbols: Optional[str] = Query(None, description="Comma-separated symbols (default: all)"),
+    per_symbol: bool = Query(False),
+):
+    """Replay the SMA/momentum predictor over stored history and report accuracy and throughput."""
+    db = get_db()
+    symbol_list = [s.strip() for s in symbols.split(",") if s.strip()] if symbols else None
+    series = await load_close_history(db, symbol_list)
+
+    # Scoring is CPU-bound; keep it off the event loop
+    report = await asyncio.to_thread(
+        run_backtest,
+        series,
+        horizon,
+        neutral_band,
+        workers or settings.BACKTEST_WORKERS,
+        per_symbol,
+    )
+    return success_response(data=report, message="Backtest complete")
+
+
+@router.post("/news/ingest")
+async def ingest_news(
+    request: Request,
+    user=Depends(get_admin_user),
+    batch_size: Optional[int] = Query(None, ge=1, le=50000),
+):
+    """
+    Bulk-ingest news from an NDJSON request body (one article per line).
+
+    The body is consumed as a stream, so large uploads are never held in memory.
+    """
+    report = await ingest_ndjson(request.stream(), batch_size)
+    return success_response(data=report, message=f"Ingested {report['inserted']} news items")
+
+
+@router.get("/jobs")
+async def get_job_metrics(user=Depends(get_admin_user)):
+    """Background job schedule, run counts and duration metrics."""
+    return success_response(data=scheduler.metrics())
+
+
+@router.get("/websockets")
+async def get_websocket_metrics(user=Depends(get_admin_user)):
+    """Live, reaped and rejected connections, queue depth and dropped frames per WebSocket manager."""
+    return success_response(data={
+        "managers": websocket_metrics(),
+        "limits": connection_limits(),
+        "bus": bus.metrics(),
+    })
+
+
+@router.get("/write-behind")
+async def get_write_behind_metrics(user=Depends(get_admin_user)):
+    """Buffered insert counts, batch sizes and flush latency per collection."""
+    return success_response(data=write_behind.metrics())
+
+
+@router.get("/rate-limits")
+async def get_rate_limit_metrics(user=Depends(get_admin_user)):
+    """Tracked keys, memory use and allowed/limited counts per rate limiter."""
+    return success_response(data=rate_limit_metrics())
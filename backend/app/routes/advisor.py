@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends
 from ..models.schemas import AdvisorQueryInput
 from ..services.auth import get_current_user
 from ..services.advisor import generate_advice
+from ..services.write_behind import write_behind
 from ..database import get_db
 from ..utils.responses import success_response
 
@@ -32,7 +33,7 @@ async def analyze_portfolio(inp: AdvisorQueryInput, user=Depends(get_current_use
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
     
-    await db.chat_history.insert_one(record)
+    await write_behind.insert("chat_history", record)
     
     return success_response(data=advice)
 
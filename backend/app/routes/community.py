@@ -1,22 +1,20 @@
 """Community chat module routes."""
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from ..services.auth import get_current_user
-from ..database import get_db
+from ..services.chat_history import DEFAULT_ROOM, chat_history, normalize_room
 from ..utils.responses import success_response
 
 router = APIRouter(prefix="/community", tags=["community"])
 
 
 @router.get("/messages")
-async def get_community_messages(user=Depends(get_current_user)):
-    """Get recent community chat messages."""
-    db = get_db()
-    
-    messages = await db.community_chat.find(
-        {},
-        {"_id": 0}
-    ).sort("timestamp", -1).limit(50).to_list(50)
-    
-    # Reverse to show oldest first
-    return success_response(data=list(reversed(messages)))
+async def get_community_messages(
+    room: str = Query(DEFAULT_ROOM),
+    user=Depends(get_current_user)
+):
+    """Get a room's recent chat messages (oldest first, served from memory)."""
+    name = normalize_room(room)
+    if name is None:
+        raise HTTPException(status_code=400, detail="Invalid room name")
+    return success_response(data=chat_history.messages(name))
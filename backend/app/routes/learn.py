@@ -6,6 +6,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from ..models.schemas import QuizSubmitInput, TaxCompareInput
 from ..services.auth import get_current_user
 from ..services.tax import calculate_old_regime_tax, calculate_new_regime_tax
+from ..services.write_behind import write_behind
 from ..database import get_db
 from ..utils.responses import success_response
 
@@ -79,7 +80,7 @@ async def submit_quiz(inp: QuizSubmitInput, user=Depends(get_current_user)):
         "completedAt": datetime.now(timezone.utc).isoformat()
     }
     
-    await db.quiz_scores.insert_one(record)
+    await write_behind.insert("quiz_scores", record)
     
     return success_response(
         data={
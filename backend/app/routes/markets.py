@@ -2,12 +2,21 @@
 import uuid
 import math
 from datetime import datetime, timezone, timedelta
-from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 
 from ..config import settings
 from ..models.schemas import PredictionInput
 from ..services.auth import get_current_user
-from ..services.market import predict_stock_direction, analyze_sentiment
+from ..services.market import predict_stock_direction
+from ..services.news import news_sentiment
+from ..services.entities import get_symbol_news
+from ..services.sector_sentiment import get_sentiment_trend
+from ..services.prices import price_book
+from ..services.heatmap import sector_heatmap, load_heatmap
+from ..services.predictions import record_prediction, get_prediction_stats, prediction_accuracy
+from ..services.leaderboard import leaderboard, GLOBAL_SCOPE, symbol_scope
+from ..services.consensus import get_consensus
 from ..services.alpha_vantage import (
     get_quote,
     get_time_series_daily,
@@ -15,6 +24,7 @@ from ..services.alpha_vantage import (
     get_alpha_metadata_by_symbol,
     get_metadata_for_alpha,
 )
+from ..services.write_behind import write_behind
 from ..database import get_db
 from ..utils.responses import success_response
 
@@ -47,6 +57,7 @@ async def _stocks_from_alpha():
                 "currency": "USD",
             })
             continue
+        price_book.update(meta["symbol"], quote)
         stocks.append({
             "symbol": meta["symbol"],
             "name": meta["name"],
@@ -119,6 +130,16 @@ async def get_stock_detail(symbol: str, user=Depends(get_current_user)):
     return success_response(data=stock)
 
 
+@router.get("/stocks/{symbol}/news")
+async def get_stock_news(
+    symbol: str,
+    user=Depends(get_current_user),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """Newest news mentioning a symbol (entity links from ingestion)."""
+    return success_response(data=await get_symbol_news(symbol, limit))
+
+
 @router.post("/predict")
 async def submit_prediction(inp: PredictionInput, user=Depends(get_current_user)):
     """Submit user's stock prediction and compare with AI."""
@@ -150,10 +171,13 @@ async def submit_prediction(inp: PredictionInput, user=Depends(get_current_user)
         "aiConfidence": ai_prediction["confidence"],
         "correct": correct,
         "explanation": ai_prediction["explanation"],
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        # Counted by record_prediction below, so the stats backfill skips it
+        "statsCounted": True
     }
     
-    await db.predictions.insert_one(record)
+    await write_behind.insert("predictions", record)
+    await record_prediction(user["id"], record["stockSymbol"], correct)
     
     return success_response(
         data={
@@ -180,63 +204,89 @@ async def get_user_predictions(
     # Get paginated predictions
     predictions = await db.predictions.find(
         {"userId": user["id"]},
-        {"_id": 0}
+        {"_id": 0, "statsCounted": 0}
     ).sort("timestamp", -1).skip(skip).limit(limit).to_list(limit)
     
-    # Get total count for pagination
-    total = await db.predictions.count_documents({"userId": user["id"]})
-    
-    # Calculate accuracy
-    all_predictions = await db.predictions.find({"userId": user["id"]}, {"_id": 0}).to_list(1000)
-    correct_count = sum(1 for p in all_predictions if p.get("correct"))
-    accuracy = round(correct_count / len(all_predictions) * 100) if all_predictions else 0
+    # Totals and accuracy come from the incrementally maintained stats document
+    stats = await get_prediction_stats(user["id"])
+    total = stats.get("total", 0)
     
     return success_response(data={
         "predictions": predictions,
-        "accuracy": accuracy,
+        "accuracy": prediction_accuracy(stats),
         "total": total,
-        "correct": correct_count,
+        "correct": stats.get("correct", 0),
+        "currentStreak": stats.get("currentStreak", 0),
+        "bestStreak": stats.get("bestStreak", 0),
         "page": page,
         "pages": math.ceil(total / limit) if total > 0 else 0
     })
 
 
+@router.get("/leaderboard")
+async def get_prediction_leaderboard(
+    user=Depends(get_current_user),
+    symbol: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=100)
+):
+    """Get top predictors (global or per symbol) and the caller's rank from the in-memory index."""
+    scope = symbol_scope(symbol) if symbol else GLOBAL_SCOPE
+    index = leaderboard.scope(scope)
+    
+    return success_response(data={
+        "scope": scope,
+        "top": index.top(limit),
+        "me": index.rank_of(user["id"]),
+        "participants": len(index),
+        "minPredictions": settings.LEADERBOARD_MIN_PREDICTIONS,
+        "refreshedAt": leaderboard.refreshed_at
+    })
+
+
+@router.get("/consensus")
+async def get_crowd_consensus(
+    user=Depends(get_current_user),
+    symbol: Optional[str] = Query(None),
+    days: int = Query(30, ge=1, le=365)
+):
+    """Get crowd direction split and AI agreement per symbol."""
+    consensus = await get_consensus(days, symbol)
+    return success_response(data=consensus)
+
+
 @router.get("/sentiment")
 async def get_sentiment_analysis(user=Depends(get_current_user)):
     """Get sentiment analysis for all news."""
     db = get_db()
     
-    news = await db.news.find({}, {"_id": 0}).to_list(50)
+    news = await db.news.find(
+        {"duplicateOf": None},
+        {"_id": 0, "scorerVersion": 0, "simhash": 0, "simhashBands": 0}
+    ).to_list(50)
     
-    # Add sentiment analysis to each news item
+    # Sentiment is stored at write time; expose it under the response key
     for news_item in news:
-        news_item["sentiment_analysis"] = analyze_sentiment(news_item.get("content", ""))
+        news_item["sentiment_analysis"] = news_sentiment(news_item)
+        news_item.pop("sentiment", None)
     
     return success_response(data=news)
 
 
+@router.get("/sentiment/trend")
+async def get_sector_sentiment_trend(
+    user=Depends(get_current_user),
+    granularity: str = Query("day", pattern="^(hour|day)$"),
+    points: int = Query(30, ge=1, le=365),
+    sector: Optional[str] = Query(None),
+):
+    """Per-sector sentiment series over the latest hourly or daily buckets."""
+    trend = await get_sentiment_trend(granularity, points, sector)
+    return success_response(data=trend)
+
+
 @router.get("/heatmap")
 async def get_market_heatmap(user=Depends(get_current_user)):
-    """Get market heatmap by sector. Uses Alpha Vantage when API key is set; falls back to DB on failure."""
-    db = get_db()
-    if settings.ALPHA_VANTAGE_API_KEY:
-        stocks = await _stocks_from_alpha()
-        if not stocks or not any(s.get("currentPrice") for s in stocks):
-            stocks = await db.stocks.find({}, {"_id": 0}).to_list(50)
-    else:
-        stocks = await db.stocks.find({}, {"_id": 0}).to_list(50)
-    heatmap = {}
-    for stock in stocks:
-        sector = stock.get("sector", "Other")
-        change = stock.get("change", 0)
-        if sector not in heatmap:
-            heatmap[sector] = {"sector": sector, "stocks": [], "avgChange": 0}
-        heatmap[sector]["stocks"].append({
-            "symbol": stock["symbol"],
-            "name": stock.get("name", stock["symbol"]),
-            "change": round(change, 2),
-        })
-    for sector_data in heatmap.values():
-        changes = [s["change"] for s in sector_data["stocks"]]
-        sector_data["avgChange"] = round(sum(changes) / len(changes), 2) if changes else 0
-    return success_response(data=list(heatmap.values()))
+    """Get market heatmap by sector from the materialized, incrementally updated snapshot."""
+    if not sector_heatmap.loaded:
+        await load_heatmap()
+    return Response(content=sector_heatmap.snapshot(), media_type="application/json")
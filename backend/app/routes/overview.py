@@ -3,7 +3,8 @@ from fastapi import APIRouter, Depends
 
 from ..services.auth import get_current_user
 from ..services.financial import calculate_financial_health, calculate_risk_personality
-from ..services.market import analyze_sentiment
+from ..services.predictions import get_prediction_stats, prediction_accuracy
+from ..services.sector_sentiment import get_sector_strip
 from ..database import get_db
 from ..utils.responses import success_response
 
@@ -41,9 +42,7 @@ async def get_overview_summary(user=Depends(get_current_user)):
     ] if total_value > 0 else []
     
     # Prediction accuracy
-    predictions = await db.predictions.find({"userId": user["id"]}, {"_id": 0}).to_list(100)
-    correct_predictions = sum(1 for p in predictions if p.get("correct"))
-    prediction_accuracy = round(correct_predictions / len(predictions) * 100) if predictions else 0
+    prediction_stats = await get_prediction_stats(user["id"])
     
     # Tax optimization score (heuristic)
     tax_score = 65
@@ -58,26 +57,8 @@ async def get_overview_summary(user=Depends(get_current_user)):
     # Scam awareness score
     scam_score = 85
     
-    # Sector sentiment analysis
-    news = await db.news.find({}, {"_id": 0}).to_list(50)
-    sector_sentiments = {}
-    
-    for news_item in news:
-        sector = news_item.get("sector", "Other")
-        sentiment = analyze_sentiment(news_item.get("content", ""))
-        
-        if sector not in sector_sentiments:
-            sector_sentiments[sector] = []
-        sector_sentiments[sector].append(sentiment["score"])
-    
-    sentiment_strip = [
-        {
-            "sector": sector,
-            "score": round(sum(scores)/len(scores), 2),
-            "label": "Bullish" if sum(scores)/len(scores) > 0.6 else ("Bearish" if sum(scores)/len(scores) < 0.4 else "Neutral")
-        }
-        for sector, scores in sector_sentiments.items()
-    ]
+    # Sector sentiment strip (precomputed daily buckets, shared across users)
+    sentiment_strip = await get_sector_strip()
     
     # AI insight from last advice
     last_advice = await db.chat_history.find_one(
@@ -96,7 +77,7 @@ async def get_overview_summary(user=Depends(get_current_user)):
         "riskPersonality": risk,
         "portfolioAllocation": allocation_list,
         "totalValue": round(total_value),
-        "predictionAccuracy": prediction_accuracy,
+        "predictionAccuracy": prediction_accuracy(prediction_stats),
         "taxOptimization": {
             "score": tax_score,
             "explanation": "Based on asset type diversity and tax-efficient instruments."
@@ -12,6 +12,7 @@ from ..services.tax import (
 )
 from ..services.financial import calculate_financial_health
 from ..database import get_db
+from ..services.alerts import notify_holdings_changed
 from ..utils.responses import success_response
 
 router = APIRouter(prefix="/portfolio", tags=["portfolio"])
@@ -148,6 +149,7 @@ async def add_asset(inp: AddAssetInput, user=Depends(get_current_user)):
     }
     
     await db.assets.insert_one(asset)
+    await notify_holdings_changed(user["id"])
     
     # Recalculate financial health
     assets = await db.assets.find({"userId": user["id"]}, {"_id": 0}).to_list(100)
@@ -0,0 +1,147 @@
+"""Market alerts from high-impact news - one idempotent bulk write per run."""
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from ..database import get_db
+from .pubsub import bus
+from .news import news_impact, news_sentiment
+
+logger = logging.getLogger(__name__)
+
+ALERT_MIN_IMPACT = 75
+HIGH_SEVERITY_IMPACT = 85
+
+# Severity order for subscription thresholds
+SEVERITY_LEVELS = {"Medium": 1, "High": 2}
+
+DUPLICATE_KEY = 11000
+
+# Bus channel announcing that a user's portfolio changed
+HOLDINGS_CHANNEL = "holdings"
+
+# Fields alert creation needs from a news item (content only matters for unscored legacy items)
+NEWS_PROJECTION = {
+    "_id": 1, "id": 1, "title": 1, "content": 1, "sector": 1, "symbols": 1,
+    "sentiment": 1, "impactScore": 1, "duplicateOf": 1,
+}
+
+
+def build_alert(news_item: dict, impact: int, created_at: str) -> dict:
+    """Alert document for a news item; sourceNewsId makes it unique per item."""
+    sentiment = news_sentiment(news_item)
+    sector = news_item.get("sector", "market")
+    return {
+        "id": str(uuid.uuid4()),
+        "sourceNewsId": news_item["id"],
+        "title": news_item.get("title", "Market Alert"),
+        "impact_score": impact,
+        "impacted_sectors": [news_item.get("sector", "General")],
+        "symbols": news_item.get("symbols", []),
+        "severity": "High" if impact >= HIGH_SEVERITY_IMPACT else "Medium",
+        "explanation": f"{sentiment['label']} sentiment detected in {sector} sector with {sentiment['confidence']}% confidence.",
+        "created_at": created_at,
+        "is_read": False,
+    }
+
+
+async def create_alerts(news_items: List[dict], broadcast: bool = True) -> List[dict]:
+    """
+    Create alerts for the high-impact, canonical items among news_items.
+
+    All candidates go out in one unordered bulk_write of $setOnInsert
+    upserts keyed on sourceNewsId, so re-running over the same news is a
+    no-op and concurrent runs cannot double-insert (the unique index turns
+    the race into a duplicate-key error that is ignored). Newly created
+    alerts are broadcast together in a single "new_alerts" frame.
+    """
+    db = get_db()
+    created_at = datetime.now(timezone.utc).isoformat()
+    candidates = []
+    for item in news_items:
+        if item.get("duplicateOf") or "id" not in item:
+            continue
+        impact = news_impact(item)
+        if impact >= ALERT_MIN_IMPACT:
+            candidates.append(build_alert(item, impact, created_at))
+    if not candidates:
+        return []
+
+    # Alerts created before sourceNewsId existed were deduplicated by title
+    legacy = await db.alerts.distinct(
+        "title",
+        {"title": {"$in": [a["title"] for a in candidates]}, "sourceNewsId": {"$exists": False}}
+    )
+    if legacy:
+        legacy = set(legacy)
+        candidates = [a for a in candidates if a["title"] not in legacy]
+        if not candidates:
+            return []
+
+    ops = [
+        UpdateOne(
+            {"sourceNewsId": alert["sourceNewsId"]},
+            {"$setOnInsert": {k: v for k, v in alert.items() if k != "sourceNewsId"}},
+            upsert=True,
+        )
+        for alert in candidates
+    ]
+    try:
+        result = await db.alerts.bulk_write(ops, ordered=False)
+        upserted = result.upserted_ids
+    except BulkWriteError as e:
+        if any(err.get("code") != DUPLICATE_KEY for err in e.details.get("writeErrors", [])):
+            raise
+        upserted = {u["index"]: u["_id"] for u in e.details.get("upserted", [])}
+
+    created = [candidates[i] for i in sorted(upserted)]
+    if created:
+        logger.info(f"Created {len(created)} alerts from {len(candidates)} high-impact news items")
+        if broadcast:
+            await bus.publish("alerts", {"type": "new_alerts", "data": created})
+    return created
+
+
+async def detect_alerts(batch_size: int = 500) -> int:
+    """
+    Create alerts for news not yet checked.
+
+    Every news item is checked once: items without alertChecked are read
+    in batches, passed to create_alerts, then flagged. This covers seeded
+    and legacy items, and does not depend on insert order or on how long
+    an ingestion batch takes to commit. Re-processing after a crash is
+    harmless: alert creation is idempotent.
+    Returns the number of alerts created.
+    """
+    db = get_db()
+    created = 0
+
+    while True:
+        news_items = await db.news.find(
+            {"alertChecked": {"$ne": True}},
+            NEWS_PROJECTION
+        ).limit(batch_size).to_list(batch_size)
+        if not news_items:
+            break
+
+        # create_alerts skips near-duplicates; they are flagged as checked all the same
+        created += len(await create_alerts(news_items))
+        await db.news.update_many(
+            {"_id": {"$in": [item["_id"] for item in news_items]}},
+            {"$set": {"alertChecked": True}}
+        )
+        if len(news_items) < batch_size:
+            break
+    return created
+
+
+async def notify_holdings_changed(user_id: str):
+    """
+    Tell every worker that a user's assets changed, so alert filters that
+    follow holdings are rebuilt. Call after any write to db.assets.
+    """
+    await bus.publish(HOLDINGS_CHANNEL, {"userId": user_id})
@@ -2,7 +2,7 @@
 import jwt
 import bcrypt
 from datetime import datetime, timezone, timedelta
-from fastapi import HTTPException, Request
+from fastapi import HTTPException, Request, Depends
 from ..config import settings
 from ..database import get_db
 
@@ -50,3 +50,10 @@ async def get_current_user(request: Request):
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
+
+
+async def get_admin_user(user=Depends(get_current_user)):
+    """Dependency that only admits users listed in ADMIN_EMAILS."""
+    if user.get("email", "").lower() not in settings.admin_emails_list:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return user
@@ -0,0 +1,235 @@
+"""Backtesting for the SMA/momentum predictor - vectorized replay over stored history."""
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Direction codes: index into DIRECTIONS is code + 1
+DIRECTIONS = ["down", "neutral", "up"]
+
+# Confidence buckets for calibration: [50, 60), [60, 70), ... [90, 93)
+CONFIDENCE_EDGES = np.array([50, 60, 70, 80, 90, 93])
+
+
+def vectorized_predictions(closes: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Replay predict_stock_direction at every bar of a close series at once.
+
+    Window i sees closes[:i + 1], exactly like calling the predictor on
+    historical_data[:i + 1]. Returns bar indexes, direction codes (-1/0/1)
+    and rounded confidence for every bar with at least 5 closes.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    n = closes.size
+    if n < 5:
+        empty = np.empty(0, dtype=np.int64)
+        return {"index": empty, "direction": empty, "confidence": empty}
+
+    idx = np.arange(4, n)
+    start = np.maximum(idx - 9, 0)
+    csum = np.concatenate(([0.0], np.cumsum(closes)))
+
+    sma5 = (csum[idx + 1] - csum[idx - 4]) / 5
+    sma10 = (csum[idx + 1] - csum[start]) / (idx - start + 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        momentum = (closes[idx] - closes[start]) / closes[start] * 100
+    momentum = np.nan_to_num(momentum)
+
+    up = (sma5 > sma10) & (momentum > 0)
+    down = (sma5 < sma10) & (momentum < 0)
+    direction = up.astype(np.int64) - down.astype(np.int64)
+
+    confidence = np.where(
+        direction != 0,
+        np.minimum(60 + np.abs(momentum) * 5, 92),
+        50,
+    )
+
+    return {
+        "index": idx,
+        "direction": direction,
+        "confidence": np.round(confidence).astype(np.int64),
+    }
+
+
+def backtest_series(closes: np.ndarray, horizon: int = 1, neutral_band: float = 0.0) -> Dict[str, np.ndarray]:
+    """
+    Score every prediction in one series against the realised move.
+
+    The realised direction is the sign of the close-to-close return over
+    `horizon` bars; moves within +/- `neutral_band` percent count as neutral.
+    Returns additive counters so results can be merged across symbols.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    preds = vectorized_predictions(closes)
+
+    # Only bars whose outcome is already known can be scored
+    keep = preds["index"] + horizon < closes.size
+    idx = preds["index"][keep]
+    direction = preds["direction"][keep]
+    confidence = preds["confidence"][keep]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_pct = (closes[idx + horizon] / closes[idx] - 1) * 100
+    change_pct = np.nan_to_num(change_pct)
+    realised = np.where(
+        change_pct > neutral_band, 1, np.where(change_pct < -neutral_band, -1, 0)
+    )
+
+    confusion = np.bincount(
+        (direction + 1) * 3 + (realised + 1), minlength=9
+    ).reshape(3, 3)
+
+    # Calibration only applies to directional calls
+    directional = direction != 0
+    hits = directional & (direction == realised)
+    buckets = np.clip(
+        np.digitize(confidence, CONFIDENCE_EDGES) - 1, 0, len(CONFIDENCE_EDGES) - 2
+    )
+    n_buckets = len(CONFIDENCE_EDGES) - 1
+
+    return {
+        "bars": np.int64(idx.size),
+        "confusion": confusion,
+        "calibrationCount": np.bincount(buckets[directional], minlength=n_buckets),
+        "calibrationConfidence": np.bincount(
+            buckets[directional], weights=confidence[directional], minlength=n_buckets
+        ),
+        "calibrationHits": np.bincount(buckets[hits], minlength=n_buckets),
+    }
+
+
+def _backtest_chunk(args) -> Dict[str, Dict[str, np.ndarray]]:
+    """Process pool worker: backtest a chunk of (symbol, closes) pairs."""
+    chunk, horizon, neutral_band = args
+    return {
+        symbol: backtest_series(closes, horizon, neutral_band)
+        for symbol, closes in chunk
+    }
+
+
+def _pct(part, whole) -> float:
+    return round(float(part) / float(whole) * 100, 2) if whole else 0.0
+
+
+def _summarize(stats: Dict[str, np.ndarray]) -> dict:
+    """Turn merged counters into hit rate, confusion matrix and calibration."""
+    confusion = stats["confusion"]
+    directional = int(confusion[0].sum() + confusion[2].sum())
+    directional_hits = int(confusion[0, 0] + confusion[2, 2])
+    total = int(confusion.sum())
+
+    calibration = []
+    for i in range(len(CONFIDENCE_EDGES) - 1):
+        count = int(stats["calibrationCount"][i])
+        calibration.append({
+            "bucket": f"{CONFIDENCE_EDGES[i]}-{CONFIDENCE_EDGES[i + 1] - 1}",
+            "predictions": count,
+            "meanConfidence": round(float(stats["calibrationConfidence"][i]) / count, 2) if count else None,
+            "hitRate": _pct(stats["calibrationHits"][i], count) if count else None,
+        })
+
+    return {
+        "bars": int(stats["bars"]),
+        "hitRate": _pct(directional_hits, directional),
+        "accuracy": _pct(np.trace(confusion), total),
+        "coverage": _pct(directional, total),
+        "confusionMatrix": {
+            "labels": DIRECTIONS,
+            "rows": "predicted",
+            "columns": "realised",
+            "counts": confusion.tolist(),
+        },
+        "calibration": calibration,
+    }
+
+
+def run_backtest(
+    series: Dict[str, np.ndarray],
+    horizon: int = 1,
+    neutral_band: float = 0.0,
+    workers: int = 1,
+    per_symbol: bool = False,
+) -> dict:
+    """
+    Backtest the predictor over every symbol and report accuracy and throughput.
+
+    With workers > 1 symbols are split into chunks and scored in a process
+    pool; each chunk returns additive counters that are merged here. Workers
+    are capped at the CPU count and started with spawn, never fork: the
+    caller may be a thread of a server process holding event loop and
+    driver state.
+    """
+    started = time.perf_counter()
+    workers = max(1, min(workers, os.cpu_count() or 1))
+    items = [(symbol, np.asarray(closes, dtype=np.float64)) for symbol, closes in series.items()]
+
+    if workers > 1 and len(items) > 1:
+        chunk_size = max(1, -(-len(items) // (workers * 4)))
+        chunks = [
+            (items[i:i + chunk_size], horizon, neutral_band)
+            for i in range(0, len(items), chunk_size)
+        ]
+        results: Dict[str, Dict[str, np.ndarray]] = {}
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            for part in pool.map(_backtest_chunk, chunks):
+                results.update(part)
+    else:
+        results = _backtest_chunk((items, horizon, neutral_band))
+
+    merged = None
+    for stats in results.values():
+        if merged is None:
+            merged = {k: np.array(v, copy=True) for k, v in stats.items()}
+        else:
+            for k, v in stats.items():
+                merged[k] = merged[k] + v
+
+    if merged is None:
+        merged = backtest_series(np.empty(0), horizon, neutral_band)
+
+    elapsed = time.perf_counter() - started
+    report = _summarize(merged)
+    report.update({
+        "symbols": len(items),
+        "horizon": horizon,
+        "neutralBand": neutral_band,
+        "workers": workers,
+        "elapsedMs": round(elapsed * 1000, 2),
+        "barsPerSecond": round(report["bars"] / elapsed) if elapsed > 0 else 0,
+    })
+
+    if per_symbol:
+        report["perSymbol"] = [
+            {"symbol": symbol, **{k: v for k, v in _summarize(stats).items() if k in ("bars", "hitRate", "accuracy")}}
+            for symbol, stats in sorted(results.items())
+        ]
+
+    logger.info(
+        "Backtest: %d symbols, %d bars in %.1f ms (%s bars/s)",
+        report["symbols"], report["bars"], report["elapsedMs"], report["barsPerSecond"]
+    )
+    return report
+
+
+async def load_close_history(db, symbols: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """Load stored close series from the stocks collection (closes only)."""
+    query = {"symbol": {"$in": [s.upper() for s in symbols]}} if symbols else {}
+    cursor = db.stocks.find(query, {"_id": 0, "symbol": 1, "historicalData.close": 1})
+
+    series = {}
+    async for stock in cursor:
+        closes = [bar["close"] for bar in stock.get("historicalData", [])]
+        series[stock["symbol"]] = np.asarray(closes, dtype=np.float64)
+    return series
+
+
+def default_workers() -> int:
+    """Worker count used when none is configured."""
+    return max(1, (os.cpu_count() or 1) - 1)
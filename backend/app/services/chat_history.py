@@ -0,0 +1,112 @@
+"""Recent community chat kept in memory - a bounded ring buffer per room."""
+import logging
+import re
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set
+
+from ..config import settings
+from ..database import get_db
+from ..utils.frames import encode_frame
+from .heatmap import sector_heatmap
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOM = "general"
+
+# Room names: lowercase slugs such as "banking" or "reliance"
+ROOM_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_-]{0,39}$")
+
+
+def room_slug(name: str) -> str:
+    """Room name for a sector or symbol, e.g. "Oil & Gas" -> "oil-gas"."""
+    return re.sub(r"[^a-z0-9_]+", "-", name.lower()).strip("-")
+
+
+def known_rooms() -> Set[str]:
+    """The default room plus one per sector and per symbol of the active stock universe."""
+    rooms = {DEFAULT_ROOM}
+    rooms.update(room_slug(sector) for sector in sector_heatmap.sectors)
+    rooms.update(room_slug(symbol) for symbol in sector_heatmap.symbol_sector)
+    return rooms
+
+
+def normalize_room(room) -> Optional[str]:
+    """Lowercased room name, DEFAULT_ROOM when empty, or None if invalid or not a known room."""
+    if room is None or room == "":
+        return DEFAULT_ROOM
+    if not isinstance(room, str):
+        return None
+    room = room.strip().lower()
+    if not ROOM_PATTERN.match(room):
+        return None
+    return room if room in known_rooms() else None
+
+
+class ChatHistory:
+    """
+    The last `size` messages of each room, oldest first.
+
+    Filled once from Mongo at startup and appended to from the broadcast
+    bus, so history requests and reconnecting clients never query the
+    database. The encoded history frame is cached until the room changes;
+    rooms without messages get neither a buffer nor a cached frame.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.rooms: Dict[str, Deque[dict]] = {}
+        self._frames: Dict[str, str] = {}
+
+    def _room(self, room: str) -> Deque[dict]:
+        buffer = self.rooms.get(room)
+        if buffer is None:
+            buffer = self.rooms[room] = deque(maxlen=self.size)
+        return buffer
+
+    def append(self, message: dict):
+        room = message.get("room") or DEFAULT_ROOM
+        self._room(room).append(message)
+        self._frames.pop(room, None)
+
+    def on_broadcast(self, frame: dict):
+        """Bus handler for the chat channel."""
+        if frame.get("type") == "message":
+            self.append(frame["data"])
+
+    def messages(self, room: str = DEFAULT_ROOM) -> List[dict]:
+        return list(self.rooms.get(room, ()))
+
+    def history_frame(self, room: str = DEFAULT_ROOM) -> str:
+        """Pre-encoded {"type": "history"} frame for a room."""
+        frame = self._frames.get(room)
+        if frame is None:
+            frame = encode_frame({"type": "history", "room": room, "data": self.messages(room)})
+            if room in self.rooms:
+                self._frames[room] = frame
+        return frame
+
+    async def load(self):
+        """Fill each known room's buffer with its most recent stored messages, in one aggregation."""
+        db = get_db()
+        rooms = known_rooms()
+        recent = await db.community_chat.aggregate([
+            # Messages from before rooms have no room and belong to the default room
+            {"$match": {"room": {"$in": sorted(rooms) + [None]}}},
+            {"$set": {"room": {"$ifNull": ["$room", DEFAULT_ROOM]}}},
+            {"$setWindowFields": {
+                "partitionBy": "$room",
+                "sortBy": {"timestamp": -1},
+                "output": {"recent": {"$documentNumber": {}}},
+            }},
+            {"$match": {"recent": {"$lte": self.size}}},
+            {"$sort": {"timestamp": 1}},
+            {"$project": {"_id": 0, "recent": 0}},
+        ]).to_list(None)
+        self.rooms.clear()
+        self._frames.clear()
+        for message in recent:
+            self.append(message)
+        logger.info(f"Chat history loaded: {len(recent)} messages in {len(self.rooms)} of {len(rooms)} rooms")
+
+
+chat_history = ChatHistory(settings.CHAT_HISTORY_SIZE)
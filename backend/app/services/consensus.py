@@ -0,0 +1,135 @@
+"""Crowd-vs-AI consensus per symbol - incremental materialized aggregation."""
+import logging
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from ..config import settings
+from ..database import get_db
+
+logger = logging.getLogger(__name__)
+
+JOB_ID = "consensus"
+
+# Counters stored per (symbol, day). predictions.correct means "agreed with
+# the AI", so it is the same number as agree and is not counted separately.
+COUNTERS = [
+    "total", "crowdUp", "crowdDown", "crowdNeutral",
+    "aiUp", "aiDown", "aiNeutral", "agree",
+]
+
+
+def _count_if(expression) -> dict:
+    return {"$sum": {"$cond": [expression, 1, 0]}}
+
+
+async def _claim_window(db, since: str, until: str) -> bool:
+    """Advance the high-water mark with compare-and-set so only one worker folds a window."""
+    try:
+        result = await db.job_state.update_one(
+            {"_id": JOB_ID, "hwm": since},
+            {"$set": {"hwm": until}},
+            upsert=(since == ""),
+        )
+    except DuplicateKeyError:
+        return False
+    return result.modified_count == 1 or result.upserted_id is not None
+
+
+async def refresh_consensus() -> bool:
+    """
+    Fold predictions newer than the high-water mark into symbol_consensus_daily.
+
+    Only the days the window (hwm, now - lag] touches are recomputed: their
+    predictions up to the window end are counted from scratch and $merge
+    replaces the daily documents. Re-running a window, after a failure part
+    way through the merge for instance, therefore never counts a prediction
+    twice. The lag leaves room for late writes. Returns True when this
+    worker folded a new window.
+    """
+    db = get_db()
+    state = await db.job_state.find_one({"_id": JOB_ID})
+    since = state.get("hwm", "") if state else ""
+    until = (datetime.now(timezone.utc) - timedelta(seconds=settings.CONSENSUS_LAG_SECONDS)).isoformat()
+    if until <= since:
+        return False
+    if not await _claim_window(db, since, until):
+        return False
+
+    pipeline = [
+        # From the start of the hwm's day (ISO timestamps sort by day first)
+        {"$match": {"timestamp": {"$gte": since[:10], "$lte": until}}},
+        {"$group": {
+            "_id": {"symbol": "$stockSymbol", "day": {"$substrBytes": ["$timestamp", 0, 10]}},
+            "total": {"$sum": 1},
+            "crowdUp": _count_if({"$eq": ["$predictedDirection", "up"]}),
+            "crowdDown": _count_if({"$eq": ["$predictedDirection", "down"]}),
+            "crowdNeutral": _count_if({"$eq": ["$predictedDirection", "neutral"]}),
+            "aiUp": _count_if({"$eq": ["$aiDirection", "up"]}),
+            "aiDown": _count_if({"$eq": ["$aiDirection", "down"]}),
+            "aiNeutral": _count_if({"$eq": ["$aiDirection", "neutral"]}),
+            "agree": _count_if({"$eq": ["$predictedDirection", "$aiDirection"]}),
+        }},
+        {"$project": {
+            "_id": {"$concat": ["$_id.symbol", ":", "$_id.day"]},
+            "symbol": "$_id.symbol",
+            "day": "$_id.day",
+            **{c: 1 for c in COUNTERS},
+        }},
+        {"$merge": {"into": "symbol_consensus_daily", "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ]
+
+    try:
+        await db.predictions.aggregate(pipeline).to_list(None)
+    except Exception:
+        # Hand the window back so the next run retries it
+        await db.job_state.update_one({"_id": JOB_ID, "hwm": until}, {"$set": {"hwm": since}})
+        raise
+
+    logger.debug(f"Consensus refreshed up to {until}")
+    return True
+
+
+def _pct(part: int, whole: int) -> float:
+    return round(part / whole * 100, 1) if whole else 0.0
+
+
+def _summarize(symbol: str, days: list) -> dict:
+    totals = {c: sum(d.get(c, 0) for d in days) for c in COUNTERS}
+    total = totals["total"]
+    return {
+        "symbol": symbol,
+        "predictions": total,
+        "crowd": {
+            "up": _pct(totals["crowdUp"], total),
+            "down": _pct(totals["crowdDown"], total),
+            "neutral": _pct(totals["crowdNeutral"], total),
+        },
+        "ai": {
+            "up": _pct(totals["aiUp"], total),
+            "down": _pct(totals["aiDown"], total),
+            "neutral": _pct(totals["aiNeutral"], total),
+        },
+        "aiAgreementRate": _pct(totals["agree"], total),
+        "daily": [
+            {"day": d["day"], "predictions": d["total"], "aiAgreementRate": _pct(d.get("agree", 0), d["total"])}
+            for d in sorted(days, key=lambda d: d["day"])
+        ],
+    }
+
+
+async def get_consensus(days: int, symbol: Optional[str] = None) -> list:
+    """Crowd split and AI agreement per symbol over the last `days` days."""
+    db = get_db()
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    query = {"day": {"$gte": cutoff}}
+    if symbol:
+        query["symbol"] = symbol.upper()
+
+    grouped = {}
+    cursor = db.symbol_consensus_daily.find(query, {"_id": 0})
+    async for doc in cursor:
+        grouped.setdefault(doc["symbol"], []).append(doc)
+
+    return [_summarize(sym, docs) for sym, docs in sorted(grouped.items())]
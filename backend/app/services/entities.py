@@ -0,0 +1,125 @@
+"""News-to-symbol entity linking and per-symbol news lookups."""
+import logging
+from typing import Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from ..database import get_db
+from ..utils.aho_corasick import AhoCorasick
+from ..utils.http_cache import content_versions
+from .alpha_vantage import ALPHA_STOCK_METADATA, STOCK_METADATA
+
+logger = logging.getLogger(__name__)
+
+# Common names the metadata does not spell out
+SYMBOL_ALIASES: Dict[str, List[str]] = {
+    "RELIANCE": ["Reliance", "RIL"],
+    "TCS": ["Tata Consultancy"],
+    "HDFCBANK": ["HDFC"],
+    "INFY": ["Infosys", "Infy"],
+    "ITC": ["ITC"],
+    "BHARTIARTL": ["Airtel", "Bharti"],
+    "SBIN": ["SBI", "State Bank"],
+    "SUNPHARMA": ["Sun Pharmaceutical"],
+    "AAPL": ["Apple"],
+    "MSFT": ["Microsoft"],
+    "GOOGL": ["Alphabet", "Google"],
+    "AMZN": ["Amazon"],
+    "NVDA": ["Nvidia"],
+}
+
+# Fields of a news item returned by the per-symbol feed
+SUMMARY_FIELDS = ("id", "title", "sector", "date", "ingestedAt", "sentiment", "impactScore", "symbols")
+
+
+class EntityLinker:
+    """Tags text with the symbols whose ticker, company name or alias it mentions."""
+
+    def __init__(self, metadata: List[dict], aliases: Dict[str, List[str]]):
+        patterns: Dict[str, str] = {}
+        for meta in metadata:
+            symbol = meta["symbol"]
+            names = [symbol, meta.get("name", "")] + aliases.get(symbol, [])
+            for name in names:
+                if name:
+                    patterns[name.lower()] = symbol
+        self.matcher: AhoCorasick[str] = AhoCorasick(patterns)
+        self.pattern_count = len(patterns)
+
+    def link(self, text: str) -> List[str]:
+        return sorted(self.matcher.values_in(text.lower()))
+
+
+_linker: Optional[EntityLinker] = None
+_linker_key: Optional[frozenset] = None
+
+
+def get_linker() -> EntityLinker:
+    """
+    Process-wide linker, compiled on first use.
+
+    Covers the Indian and US stock lists, plus the DB stocks once
+    refresh_linker() has run.
+    """
+    global _linker
+    if _linker is None:
+        _linker = EntityLinker(STOCK_METADATA + ALPHA_STOCK_METADATA, SYMBOL_ALIASES)
+        logger.info(f"Entity linker compiled: {_linker.pattern_count} patterns")
+    return _linker
+
+
+async def refresh_linker() -> EntityLinker:
+    """Recompile the linker if the stocks collection has new, renamed or removed symbols."""
+    global _linker, _linker_key
+    db = get_db()
+    stocks = await db.stocks.find({}, {"_id": 0, "symbol": 1, "name": 1}).to_list(None)
+    key = frozenset((s["symbol"], s.get("name", "")) for s in stocks)
+    if _linker is None or key != _linker_key:
+        _linker = EntityLinker(STOCK_METADATA + ALPHA_STOCK_METADATA + stocks, SYMBOL_ALIASES)
+        _linker_key = key
+        logger.info(f"Entity linker compiled: {_linker.pattern_count} patterns")
+    return _linker
+
+
+def link_news_items(items: List[dict]) -> List[dict]:
+    """Attach the symbols mentioned in each item's title and content, in place."""
+    linker = get_linker()
+    for item in items:
+        item["symbols"] = linker.link(f"{item.get('title', '')} {item.get('content', '')}")
+    return items
+
+
+async def get_symbol_news(symbol: str, limit: int) -> List[dict]:
+    """Newest canonical news mentioning a symbol (symbols/date/ingestedAt index)."""
+    db = get_db()
+    return await db.news.find(
+        {"symbols": symbol.upper(), "duplicateOf": None},
+        {"_id": 0, **{k: 1 for k in SUMMARY_FIELDS}}
+    ).sort([("date", -1), ("ingestedAt", -1)]).limit(limit).to_list(limit)
+
+
+async def link_untagged_news(batch_size: int = 500) -> int:
+    """Tag news stored before entity linking existed (one-off backfill)."""
+    db = get_db()
+    await refresh_linker()
+    tagged = 0
+
+    while True:
+        batch = await db.news.find(
+            {"symbols": {"$exists": False}},
+            {"_id": 1, "title": 1, "content": 1}
+        ).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+
+        link_news_items(batch)
+        await db.news.bulk_write([
+            UpdateOne({"_id": item["_id"]}, {"$set": {"symbols": item["symbols"]}})
+            for item in batch
+        ], ordered=False)
+        tagged += len(batch)
+
+    if tagged:
+        content_versions.bump("news")
+        logger.info(f"Linked symbols for {tagged} news items")
+    return tagged
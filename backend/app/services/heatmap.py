@@ -0,0 +1,159 @@
+"""Materialized sector heatmap - maintained incrementally from price changes."""
+import json
+import logging
+from typing import Dict, Iterable, Optional
+
+from ..config import settings
+from ..database import get_db
+from ..utils.http_cache import content_versions
+from ..utils.responses import success_response
+from .alpha_vantage import get_metadata_for_alpha
+from .prices import price_book
+
+logger = logging.getLogger(__name__)
+
+
+class SectorHeatmap:
+    """
+    Sector -> members with running change totals and advancer/decliner counts.
+
+    A price change touches one member and its sector's counters in O(1);
+    the serialized response is rebuilt lazily on the next read after a change.
+    """
+
+    def __init__(self):
+        self.sectors: Dict[str, dict] = {}
+        self.symbol_sector: Dict[str, str] = {}
+        self.loaded = False
+        self.version = 0
+        self._snapshot: Optional[bytes] = None
+
+    def load(self, stocks: Iterable[dict]):
+        """
+        Replace the heatmap with the given stocks (symbol, name, sector, change).
+
+        Built from scratch into a fresh map and swapped in, so stocks that
+        no longer exist drop out and readers never see a half-built map.
+        """
+        fresh = SectorHeatmap()
+        for stock in stocks:
+            fresh.upsert(stock["symbol"], stock.get("name"), stock.get("sector"), stock.get("change", 0))
+        self.sectors = fresh.sectors
+        self.symbol_sector = fresh.symbol_sector
+        self.loaded = True
+        self._invalidate()
+
+    def upsert(self, symbol: str, name: Optional[str], sector: Optional[str], change: float):
+        """Add a stock or move it to a new sector."""
+        sector = sector or "Other"
+        if self.symbol_sector.get(symbol) not in (None, sector):
+            self._remove(symbol)
+
+        bucket = self.sectors.setdefault(sector, {
+            "members": {}, "changeSum": 0.0, "advancers": 0, "decliners": 0
+        })
+        if symbol in bucket["members"]:
+            bucket["members"][symbol]["name"] = name or symbol
+            self.update_change(symbol, change)
+            return
+
+        change = round(change or 0, 2)
+        bucket["members"][symbol] = {"symbol": symbol, "name": name or symbol, "change": change}
+        bucket["changeSum"] += change
+        bucket["advancers"] += change > 0
+        bucket["decliners"] += change < 0
+        self.symbol_sector[symbol] = sector
+        self._invalidate()
+
+    def update_change(self, symbol: str, change: float) -> bool:
+        """Apply a new percent change to one member; returns False for unknown symbols."""
+        sector = self.symbol_sector.get(symbol)
+        if sector is None:
+            return False
+
+        bucket = self.sectors[sector]
+        member = bucket["members"][symbol]
+        old, new = member["change"], round(change or 0, 2)
+        if old == new:
+            return True
+
+        member["change"] = new
+        bucket["changeSum"] += new - old
+        bucket["advancers"] += (new > 0) - (old > 0)
+        bucket["decliners"] += (new < 0) - (old < 0)
+        self._invalidate()
+        return True
+
+    def _remove(self, symbol: str):
+        sector = self.symbol_sector.pop(symbol)
+        bucket = self.sectors[sector]
+        old = bucket["members"].pop(symbol)["change"]
+        bucket["changeSum"] -= old
+        bucket["advancers"] -= old > 0
+        bucket["decliners"] -= old < 0
+        if not bucket["members"]:
+            del self.sectors[sector]
+
+    def on_price_change(self, symbol: str, changed: dict, fields: dict):
+        """PriceBook listener: fold a changed quote into the heatmap."""
+        if symbol in self.symbol_sector:
+            if "change" in changed:
+                self.update_change(symbol, changed["change"])
+        elif self.loaded and fields.get("sector"):
+            self.upsert(symbol, fields.get("name"), fields["sector"], fields.get("change", 0))
+
+    def _invalidate(self):
+        self.version += 1
+        self._snapshot = None
+        content_versions.bump("heatmap")
+
+    def to_list(self) -> list:
+        """Heatmap rows in the /markets/heatmap response format."""
+        rows = []
+        for sector, bucket in self.sectors.items():
+            count = len(bucket["members"])
+            rows.append({
+                "sector": sector,
+                "stocks": list(bucket["members"].values()),
+                "avgChange": round(bucket["changeSum"] / count, 2) if count else 0,
+                "advancers": bucket["advancers"],
+                "decliners": bucket["decliners"],
+            })
+        return rows
+
+    def snapshot(self) -> bytes:
+        """Pre-serialized success response, rebuilt only after a change."""
+        if self._snapshot is None:
+            self._snapshot = json.dumps(
+                success_response(data=self.to_list()), separators=(",", ":")
+            ).encode()
+        return self._snapshot
+
+
+sector_heatmap = SectorHeatmap()
+
+
+async def load_heatmap():
+    """
+    Rebuild the heatmap from the active stock universe.
+
+    Uses the Alpha Vantage list when an API key is set and the price book
+    has quotes for it; otherwise (no key, or no quotes yet) the DB stocks.
+    """
+    if settings.ALPHA_VANTAGE_API_KEY:
+        metadata = get_metadata_for_alpha()
+        quotes = price_book.snapshot(m["symbol"] for m in metadata)
+        if any(q.get("currentPrice") for q in quotes.values()):
+            sector_heatmap.load(
+                {**meta, "change": quotes.get(meta["symbol"], {}).get("change", 0)}
+                for meta in metadata
+            )
+            logger.info(f"Sector heatmap loaded: {len(sector_heatmap.symbol_sector)} stocks")
+            return
+
+    db = get_db()
+    stocks = await db.stocks.find(
+        {}, {"_id": 0, "symbol": 1, "name": 1, "sector": 1, "change": 1}
+    ).to_list(None)
+    sector_heatmap.load(stocks)
+    logger.info(f"Sector heatmap loaded: {len(sector_heatmap.symbol_sector)} stocks")
@@ -0,0 +1,288 @@
+"""Bulk news ingestion - streamed NDJSON, batched scoring, hash-deduped inserts."""
+import asyncio
+import json
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from ..config import settings
+from ..database import get_db
+from ..utils.http_cache import content_versions
+from ..utils.simhash import BandIndex, from_hex
+from .entities import link_news_items, refresh_linker
+from .sector_sentiment import record_sentiment
+from .news import fingerprint_news_item, score_news_items
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Split a stream of byte chunks into lines without buffering the whole body."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+def normalize_date(value) -> Optional[str]:
+    """YYYY-MM-DD for an ISO date or datetime string (aware ones in UTC); None otherwise."""
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime("%Y-%m-%d")
+
+
+def prepare_batch(lines: List[bytes], ingested_at: str) -> Tuple[List[dict], int, int]:
+    """
+    Parse, validate, fingerprint and symbol-tag one batch of NDJSON lines.
+
+    Returns (documents, invalid, duplicates); items repeated within the
+    batch are dropped here so the database only sees one copy. Items whose
+    date does not parse are invalid: the date becomes a sentiment bucket.
+    Ids are always assigned here; a client id is kept as sourceId.
+    """
+    docs = []
+    seen = set()
+    invalid = duplicates = 0
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            raw = json.loads(line)
+        except ValueError:
+            invalid += 1
+            continue
+        if not isinstance(raw, dict) or not raw.get("title") or not raw.get("content"):
+            invalid += 1
+            continue
+
+        date = normalize_date(raw["date"]) if raw.get("date") else ingested_at[:10]
+        if date is None:
+            invalid += 1
+            continue
+
+        doc = {
+            "id": str(uuid.uuid4()),
+            "title": str(raw["title"]),
+            "content": str(raw["content"]),
+            "sector": raw.get("sector") or "Other",
+            "date": date,
+        }
+        if raw.get("id"):
+            doc["sourceId"] = str(raw["id"])
+        if raw.get("source"):
+            doc["source"] = str(raw["source"])
+        fingerprint_news_item(doc)
+        if doc["contentHash"] in seen:
+            duplicates += 1
+            continue
+        seen.add(doc["contentHash"])
+        doc["ingestedAt"] = ingested_at
+        docs.append(doc)
+
+    link_news_items(docs)
+    return docs, invalid, duplicates
+
+
+async def mark_near_duplicates(db, docs: List[dict]) -> int:
+    """
+    Point near-duplicates at their canonical item via duplicateOf.
+
+    Candidates are fetched with one query on the band keys of the whole
+    batch, then compared by Hamming distance in memory; items earlier in
+    the batch are candidates for later ones. Returns the number marked.
+    """
+    if not docs:
+        return 0
+    index = BandIndex(settings.SIMHASH_MAX_DISTANCE)
+    band_keys = list({band for doc in docs for band in doc["simhashBands"]})
+    cursor = db.news.find(
+        {"simhashBands": {"$in": band_keys}, "duplicateOf": None},
+        {"_id": 0, "id": 1, "simhash": 1, "simhashBands": 1}
+    )
+    async for existing in cursor:
+        index.add(existing["id"], from_hex(existing["simhash"]), existing["simhashBands"])
+
+    marked = 0
+    for doc in docs:
+        fingerprint = from_hex(doc["simhash"])
+        canonical = index.find(fingerprint, doc["simhashBands"])
+        if canonical:
+            doc["duplicateOf"] = canonical
+            marked += 1
+        else:
+            index.add(doc["id"], fingerprint, doc["simhashBands"])
+    return marked
+
+
+async def _insert_batch(db, docs: List[dict]) -> Tuple[int, set]:
+    """
+    Unordered insert; returns (inserted, indexes rejected as duplicates).
+
+    Write errors other than duplicate keys propagate.
+    """
+    if not docs:
+        return 0, set()
+    try:
+        result = await db.news.insert_many(docs, ordered=False)
+        return len(result.inserted_ids), set()
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        others = [err for err in errors if err.get("code") != DUPLICATE_KEY]
+        if others:
+            raise
+        return e.details.get("nInserted", 0), {err["index"] for err in errors}
+
+
+async def _repoint_orphans(db, docs: List[dict], rejected: set) -> int:
+    """
+    Fix near-duplicates whose in-batch canonical was rejected by the contentHash index.
+
+    They are re-pointed at the stored item with that hash (or its own
+    canonical). If that item is gone, they become canonical themselves and
+    are scored. Documents are updated in place as well as in Mongo.
+    Returns the number of documents fixed.
+    """
+    rejected_hashes = {
+        docs[i]["id"]: docs[i]["contentHash"]
+        for i in rejected if "duplicateOf" not in docs[i]
+    }
+    orphans = [
+        doc for i, doc in enumerate(docs)
+        if i not in rejected and doc.get("duplicateOf") in rejected_hashes
+    ]
+    if not orphans:
+        return 0
+
+    stored = {}
+    cursor = db.news.find(
+        {"contentHash": {"$in": list(set(rejected_hashes.values()))}},
+        {"_id": 0, "id": 1, "contentHash": 1, "duplicateOf": 1}
+    )
+    async for existing in cursor:
+        stored[existing["contentHash"]] = existing.get("duplicateOf") or existing["id"]
+
+    ops, unlinked = [], []
+    for doc in orphans:
+        canonical = stored.get(rejected_hashes[doc["duplicateOf"]])
+        if canonical:
+            doc["duplicateOf"] = canonical
+            ops.append(UpdateOne({"id": doc["id"]}, {"$set": {"duplicateOf": canonical}}))
+        else:
+            del doc["duplicateOf"]
+            unlinked.append(doc)
+    if unlinked:
+        await asyncio.to_thread(score_news_items, unlinked)
+        for doc in unlinked:
+            ops.append(UpdateOne({"id": doc["id"]}, {
+                "$set": {k: doc[k] for k in ("sentiment", "impactScore", "scorerVersion")},
+                "$unset": {"duplicateOf": ""},
+            }))
+    await db.news.bulk_write(ops, ordered=False)
+    return len(orphans)
+
+
+async def _count_duplicates(db, docs: List[dict], rejected: set):
+    """Add inserted near-duplicates to their canonical item's duplicateCount."""
+    counts = {}
+    for i, doc in enumerate(docs):
+        if "duplicateOf" in doc and i not in rejected:
+            counts[doc["duplicateOf"]] = counts.get(doc["duplicateOf"], 0) + 1
+    if counts:
+        await db.news.bulk_write([
+            UpdateOne({"id": canonical}, {"$inc": {"duplicateCount": n}})
+            for canonical, n in counts.items()
+        ], ordered=False)
+
+
+async def ingest_ndjson(chunks: AsyncIterable[bytes], batch_size: int = None) -> dict:
+    """
+    Ingest newline-delimited JSON news from a byte stream.
+
+    Each line is {"title", "content", "sector"?, "date"?, "id"?, "source"?}.
+    Lines are grouped into batches; parsing and scoring run in a worker
+    thread while the event loop keeps serving, and each batch is written
+    with a single unordered insert_many. Items whose normalized content
+    hash already exists are rejected by the unique index and counted as
+    duplicates. Near-duplicates (SimHash) are stored unscored with
+    duplicateOf set. Returns totals plus per-batch throughput.
+    """
+    db = get_db()
+    batch_size = batch_size or settings.INGEST_BATCH_SIZE
+    # Link against the current stocks collection (synthetic or newly added symbols)
+    await refresh_linker()
+    started = time.perf_counter()
+    totals = {"received": 0, "inserted": 0, "duplicates": 0, "nearDuplicates": 0, "invalid": 0}
+    batches = []
+
+    async def flush(lines: List[bytes]):
+        batch_started = time.perf_counter()
+        ingested_at = datetime.now(timezone.utc).isoformat()
+        docs, invalid, batch_dupes = await asyncio.to_thread(prepare_batch, lines, ingested_at)
+        await mark_near_duplicates(db, docs)
+        await asyncio.to_thread(score_news_items, [d for d in docs if "duplicateOf" not in d])
+        inserted, rejected = await _insert_batch(db, docs)
+        await _repoint_orphans(db, docs, rejected)
+        await _count_duplicates(db, docs, rejected)
+        stored = [d for i, d in enumerate(docs) if i not in rejected]
+        await record_sentiment(stored)
+        elapsed = time.perf_counter() - batch_started
+
+        stats = {
+            "batch": len(batches) + 1,
+            "received": len(lines),
+            "inserted": inserted,
+            "duplicates": batch_dupes + len(rejected),
+            "nearDuplicates": sum(1 for i, d in enumerate(docs) if i not in rejected and "duplicateOf" in d),
+            "invalid": invalid,
+            "ms": round(elapsed * 1000, 2),
+            "itemsPerSecond": round(len(lines) / elapsed) if elapsed > 0 else 0,
+        }
+        batches.append(stats)
+        for key in totals:
+            totals[key] += stats[key]
+        logger.info(
+            f"Ingest batch {stats['batch']}: {inserted}/{len(lines)} inserted, "
+            f"{stats['duplicates']} duplicates, {stats['nearDuplicates']} near-duplicates, {invalid} invalid, {stats['itemsPerSecond']} items/s"
+        )
+
+    lines: List[bytes] = []
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        lines.append(line)
+        if len(lines) >= batch_size:
+            await flush(lines)
+            lines = []
+    if lines:
+        await flush(lines)
+
+    if totals["inserted"]:
+        content_versions.bump("news")
+
+    elapsed = time.perf_counter() - started
+    return {
+        **totals,
+        "batchSize": batch_size,
+        "ms": round(elapsed * 1000, 2),
+        "itemsPerSecond": round(totals["received"] / elapsed) if elapsed > 0 else 0,
+        "batches": batches,
+    }
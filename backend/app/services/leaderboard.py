@@ -0,0 +1,141 @@
+"""Prediction leaderboard - periodic $merge ranking plus an in-memory rank index."""
+import bisect
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from ..config import settings
+from ..database import get_db
+from .predictions import backfill_prediction_stats, symbol_key
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = "global"
+
+
+def symbol_scope(symbol: str) -> str:
+    return f"symbol:{symbol_key(symbol.upper())}"
+
+
+def _sort_key(entry: dict) -> tuple:
+    return (-entry["accuracy"], -entry["correct"], entry["userId"])
+
+
+class RankIndex:
+    """
+    Entries of one leaderboard scope kept in rank order.
+
+    Top-N is a slice of the ordered list; a user's rank is a binary search
+    for the first entry that is not strictly better (competition ranking,
+    same as $rank in the aggregation).
+    """
+
+    def __init__(self, entries: List[dict]):
+        self.entries = sorted(entries, key=_sort_key)
+        self.keys = [_sort_key(e) for e in self.entries]
+        self.by_user = {e["userId"]: e for e in self.entries}
+
+    def top(self, n: int) -> List[dict]:
+        return self.entries[:n]
+
+    def rank_of(self, user_id: str) -> Optional[dict]:
+        entry = self.by_user.get(user_id)
+        if entry is None:
+            return None
+        better = bisect.bisect_left(self.keys, (-entry["accuracy"], -entry["correct"], ""))
+        return {**entry, "rank": better + 1}
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class Leaderboard:
+    """In-memory rank indexes for the global and per-symbol scopes."""
+
+    def __init__(self):
+        self.scopes: Dict[str, RankIndex] = {}
+        self.refreshed_at: Optional[str] = None
+
+    def scope(self, scope: str) -> RankIndex:
+        return self.scopes.get(scope) or RankIndex([])
+
+
+leaderboard = Leaderboard()
+
+
+def _ranking_stages(refreshed_at: str) -> list:
+    """Shared tail: accuracy, rank per scope, display name, then $merge."""
+    return [
+        {"$set": {"accuracy": {"$round": [{"$multiply": [{"$divide": ["$correct", "$total"]}, 100]}, 2]}}},
+        {"$setWindowFields": {
+            "partitionBy": "$scope",
+            "sortBy": {"accuracy": -1, "correct": -1},
+            "output": {"rank": {"$rank": {}}},
+        }},
+        {"$lookup": {
+            "from": "users",
+            "localField": "userId",
+            "foreignField": "id",
+            "pipeline": [{"$project": {"_id": 0, "name": 1}}],
+            "as": "user",
+        }},
+        {"$set": {
+            "_id": {"$concat": ["$scope", ":", "$userId"]},
+            "name": {"$ifNull": [{"$first": "$user.name"}, "Anonymous"]},
+            "refreshedAt": refreshed_at,
+        }},
+        {"$unset": "user"},
+        {"$merge": {"into": "leaderboard", "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ]
+
+
+async def refresh_leaderboard():
+    """
+    Rebuild the ranked leaderboard collection and reload the in-memory index.
+
+    Aggregates the per-user prediction_stats documents (one per user) rather
+    than the raw predictions, so the job cost grows with users, not history.
+    Users whose history predates the stats documents are backfilled first
+    (an indexed no-op once that has happened), so nobody is left off.
+    """
+    await backfill_prediction_stats()
+    db = get_db()
+    refreshed_at = datetime.now(timezone.utc).isoformat()
+    min_predictions = settings.LEADERBOARD_MIN_PREDICTIONS
+
+    global_pipeline = [
+        {"$match": {"total": {"$gte": min_predictions}}},
+        {"$project": {"_id": 0, "userId": 1, "scope": {"$literal": GLOBAL_SCOPE}, "total": 1, "correct": 1}},
+    ] + _ranking_stages(refreshed_at)
+
+    symbol_pipeline = [
+        {"$project": {"_id": 0, "userId": 1, "symbols": {"$objectToArray": "$bySymbol"}}},
+        {"$unwind": "$symbols"},
+        {"$project": {
+            "userId": 1,
+            "scope": {"$concat": ["symbol:", "$symbols.k"]},
+            "total": "$symbols.v.total",
+            "correct": {"$ifNull": ["$symbols.v.correct", 0]},
+        }},
+        {"$match": {"total": {"$gte": min_predictions}}},
+    ] + _ranking_stages(refreshed_at)
+
+    for pipeline in (global_pipeline, symbol_pipeline):
+        await db.prediction_stats.aggregate(pipeline).to_list(None)
+
+    # Entries older than this run were not rewritten, so they no longer qualify
+    await db.leaderboard.delete_many({"refreshedAt": {"$lt": refreshed_at}})
+    await load_leaderboard()
+
+
+async def load_leaderboard():
+    """Load the ranked collection into per-scope rank indexes."""
+    db = get_db()
+    grouped: Dict[str, List[dict]] = {}
+    cursor = db.leaderboard.find({}, {"_id": 0})
+    async for entry in cursor:
+        grouped.setdefault(entry["scope"], []).append(entry)
+        leaderboard.refreshed_at = entry.get("refreshedAt")
+
+    leaderboard.scopes = {scope: RankIndex(entries) for scope, entries in grouped.items()}
+    logger.info(f"Leaderboard loaded: {len(grouped)} scopes")
@@ -1,11 +1,14 @@
 """Market analysis services - predictions, sentiment, heatmap."""
 from datetime import datetime, timezone, timedelta
 
+from .sentiment import get_scorer
+
 
 def generate_stock_history(base_price: float, days: int = 90) -> list:
     """Generate pseudo-random historical stock data."""
     data = []
     price = base_price
+    today = datetime.now(timezone.utc)
     
     for i in range(days):
         # Deterministic pseudo-random value
@@ -19,7 +22,7 @@ def generate_stock_history(base_price: float, days: int = 90) -> list:
         high_price = round(max(open_price, close_price) * 1.012, 2)
         low_price = round(min(open_price, close_price) * 0.988, 2)
         
-        date = (datetime.now(timezone.utc) - timedelta(days=days - i)).strftime("%Y-%m-%d")
+        date = (today - timedelta(days=days - i)).strftime("%Y-%m-%d")
         volume = 1000000 + seed_value * 50000
         
         data.append({
@@ -72,55 +75,27 @@ def predict_stock_direction(historical_data: list) -> dict:
 
 
 def analyze_sentiment(text: str) -> dict:
-    """Analyze sentiment of text using keyword matching."""
-    positive_keywords = [
-        "growth", "profit", "surge", "rally", "bullish", "strong", 
-        "gain", "rise", "positive", "record", "high"
-    ]
-    negative_keywords = [
-        "fall", "crash", "bearish", "loss", "decline", "drop", 
-        "weak", "risk", "negative", "sell", "low"
-    ]
-    
-    words = text.lower().split()
-    
-    positive_count = sum(1 for word in words if any(kw in word for kw in positive_keywords))
-    negative_count = sum(1 for word in words if any(kw in word for kw in negative_keywords))
-    
-    total_count = positive_count + negative_count
-    
-    if total_count == 0:
-        return {
-            "score": 0.5,
-            "label": "Neutral",
-            "confidence": 40
-        }
-    
-    sentiment_score = positive_count / total_count
-    
-    if sentiment_score > 0.6:
-        label = "Bullish"
-    elif sentiment_score < 0.4:
-        label = "Bearish"
-    else:
-        label = "Neutral"
-    
-    confidence = min(50 + total_count * 10, 95)
-    
-    return {
-        "score": round(sentiment_score, 2),
-        "label": label,
-        "confidence": confidence
-    }
+    """Analyze sentiment of text using the compiled keyword lexicon."""
+    return get_scorer().score(text)
 
 
-def calculate_impact_score(news_item: dict) -> int:
-    """Calculate impact score from news sentiment."""
-    sentiment = analyze_sentiment(news_item.get("content", ""))
+def analyze_sentiment_batch(texts: list) -> list:
+    """Analyze sentiment of many texts in one call."""
+    return get_scorer().score_batch(texts)
+
+
+def impact_from_sentiment(sentiment: dict, text: str) -> int:
+    """Impact score from an already computed sentiment and the scored text."""
     score_raw = abs(sentiment["score"] - 0.5) * 200
     
-    word_count = len(news_item.get("content", "").split())
+    word_count = len(text.split())
     boost = min(word_count / 20, 1) * 10
     
     impact = min(round(score_raw + boost), 100)
     return impact
+
+
+def calculate_impact_score(news_item: dict) -> int:
+    """Calculate impact score from news sentiment."""
+    content = news_item.get("content", "")
+    return impact_from_sentiment(analyze_sentiment(content), content)
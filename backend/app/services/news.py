@@ -0,0 +1,102 @@
+"""News enrichment - sentiment and impact computed once at write time."""
+import hashlib
+import logging
+import re
+from typing import List
+
+from pymongo import UpdateOne
+
+from ..database import get_db
+from ..utils.http_cache import content_versions
+from ..utils.simhash import bands, simhash, to_hex
+from .market import analyze_sentiment, impact_from_sentiment
+from .sector_sentiment import rebuild_sector_sentiment
+from .sentiment import get_scorer
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def content_hash(item: dict) -> str:
+    """
+    Hash of the normalized title and content.
+
+    Case, punctuation and whitespace are ignored, so the same article
+    re-published with cosmetic edits hashes identically.
+    """
+    text = f"{item.get('title', '')} {item.get('content', '')}".lower()
+    normalized = _NON_WORD.sub(" ", text).strip()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def fingerprint_news_item(item: dict) -> dict:
+    """Attach the exact contentHash and the SimHash fingerprint with its band keys."""
+    item["contentHash"] = content_hash(item)
+    fingerprint = simhash(f"{item.get('title', '')} {item.get('content', '')}")
+    item["simhash"] = to_hex(fingerprint)
+    item["simhashBands"] = bands(fingerprint)
+    return item
+
+
+def score_news_items(items: List[dict]) -> List[dict]:
+    """Attach sentiment, impactScore and scorerVersion to news items in place."""
+    scorer = get_scorer()
+    contents = [item.get("content", "") for item in items]
+    for item, content, sentiment in zip(items, contents, scorer.score_batch(contents)):
+        item["sentiment"] = sentiment
+        item["impactScore"] = impact_from_sentiment(sentiment, content)
+        item["scorerVersion"] = scorer.version
+    return items
+
+
+def news_sentiment(item: dict) -> dict:
+    """Stored sentiment of a news item, computed on the fly only if not yet scored."""
+    return item.get("sentiment") or analyze_sentiment(item.get("content", ""))
+
+
+def news_impact(item: dict) -> int:
+    """Stored impact score of a news item, computed on the fly only if not yet scored."""
+    if "impactScore" in item:
+        return item["impactScore"]
+    return impact_from_sentiment(news_sentiment(item), item.get("content", ""))
+
+
+async def rescore_stale_news(batch_size: int = 500) -> int:
+    """
+    Re-score news written by a different lexicon version.
+
+    Near-duplicates are never scored; only canonical items are considered.
+
+    Runs in the background at startup; documents are fetched and updated in
+    batches of `batch_size` with one unordered bulk_write each.
+    Returns the number of documents updated.
+    """
+    db = get_db()
+    version = get_scorer().version
+    updated = 0
+
+    while True:
+        batch = await db.news.find(
+            {"scorerVersion": {"$ne": version}, "duplicateOf": None},
+            {"_id": 1, "content": 1}
+        ).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+
+        score_news_items(batch)
+        await db.news.bulk_write([
+            UpdateOne({"_id": item["_id"]}, {"$set": {
+                "sentiment": item["sentiment"],
+                "impactScore": item["impactScore"],
+                "scorerVersion": item["scorerVersion"],
+            }})
+            for item in batch
+        ], ordered=False)
+        updated += len(batch)
+
+    if updated:
+        await rebuild_sector_sentiment()
+        content_versions.bump("news")
+        logger.info(f"Re-scored {updated} news items with lexicon {version}")
+    return updated
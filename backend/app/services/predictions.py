@@ -0,0 +1,153 @@
+"""Per-user prediction statistics - maintained incrementally on every submission."""
+import logging
+from datetime import datetime, timezone
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from ..database import get_db
+
+logger = logging.getLogger(__name__)
+
+
+def symbol_key(symbol: str) -> str:
+    """Field-safe symbol key for the bySymbol sub-document."""
+    return symbol.replace(".", "_").replace("$", "_")
+
+
+def prediction_accuracy(stats: dict) -> int:
+    """Accuracy percentage from a stats document."""
+    total = stats.get("total", 0)
+    return round(stats.get("correct", 0) / total * 100) if total else 0
+
+
+def empty_stats(user_id: str) -> dict:
+    return {
+        "userId": user_id,
+        "total": 0,
+        "correct": 0,
+        "bySymbol": {},
+        "currentStreak": 0,
+        "bestStreak": 0,
+    }
+
+
+async def _apply_backfill(db, user_id: str, stats: dict):
+    """
+    Add a user's pre-stats history to their document exactly once.
+
+    The update only matches a document that record_prediction created with
+    backfilled: False. If there is none the upsert inserts a new document;
+    if it is already backfilled (or predates this flag, when stats were
+    rebuilt from full history) the insert hits the unique userId index, so
+    concurrent or repeated runs cannot double count.
+    Predictions recorded since stats existed are already in the counters,
+    so the legacy streak only seeds currentStreak for a new document.
+    """
+    inc = {"total": stats["total"], "correct": stats["correct"]}
+    for key, counts in stats["bySymbol"].items():
+        inc[f"bySymbol.{key}.total"] = counts["total"]
+        inc[f"bySymbol.{key}.correct"] = counts["correct"]
+    try:
+        await db.prediction_stats.update_one(
+            {"userId": user_id, "backfilled": False},
+            {
+                "$inc": inc,
+                "$max": {"bestStreak": stats["bestStreak"]},
+                "$set": {"backfilled": True, "updatedAt": datetime.now(timezone.utc).isoformat()},
+                "$setOnInsert": {"currentStreak": stats["currentStreak"]},
+            },
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        pass  # Already backfilled
+
+
+async def backfill_prediction_stats() -> int:
+    """
+    Fold predictions stored before per-user stats existed into prediction_stats.
+
+    Only predictions without statsCounted are read (new ones are counted by
+    record_prediction as they are made), and they are flagged once applied,
+    so after the first run this is an indexed no-op. Returns the number of
+    users backfilled.
+    """
+    db = get_db()
+    legacy = {"statsCounted": {"$ne": True}}
+    users = 0
+    current_user, stats = None, None
+
+    # Streaks need chronological order per user; only the needed fields are loaded
+    cursor = db.predictions.find(
+        legacy, {"_id": 0, "userId": 1, "stockSymbol": 1, "correct": 1}
+    ).sort([("userId", 1), ("timestamp", 1)])
+    async for p in cursor:
+        if p["userId"] != current_user:
+            if stats is not None:
+                await _apply_backfill(db, current_user, stats)
+                users += 1
+            current_user, stats = p["userId"], empty_stats(p["userId"])
+        correct = bool(p.get("correct"))
+        by_symbol = stats["bySymbol"].setdefault(symbol_key(p["stockSymbol"]), {"total": 0, "correct": 0})
+        by_symbol["total"] += 1
+        by_symbol["correct"] += correct
+        stats["total"] += 1
+        stats["correct"] += correct
+        stats["currentStreak"] = stats["currentStreak"] + 1 if correct else 0
+        stats["bestStreak"] = max(stats["bestStreak"], stats["currentStreak"])
+    if stats is not None:
+        await _apply_backfill(db, current_user, stats)
+        users += 1
+
+    if users:
+        await db.predictions.update_many(legacy, {"$set": {"statsCounted": True}})
+        logger.info(f"Prediction stats backfilled for {users} users")
+    return users
+
+
+async def record_prediction(user_id: str, symbol: str, correct: bool) -> dict:
+    """
+    Fold one prediction into the user's stats with a single atomic update.
+
+    Counters use $inc (creating the document on a user's first prediction);
+    the streak is incremented or reset in the same update. bestStreak
+    follows with $max, which is safe to apply late. The prediction itself
+    must be stored with statsCounted so the backfill skips it.
+    """
+    db = get_db()
+    key = symbol_key(symbol)
+
+    inc = {"total": 1, f"bySymbol.{key}.total": 1}
+    set_fields = {"updatedAt": datetime.now(timezone.utc).isoformat()}
+    if correct:
+        inc.update({"correct": 1, f"bySymbol.{key}.correct": 1, "currentStreak": 1})
+    else:
+        set_fields["currentStreak"] = 0
+
+    # A document created here has no pre-stats history in it yet
+    update = {"$inc": inc, "$set": set_fields, "$setOnInsert": {"backfilled": False}}
+    try:
+        stats = await db.prediction_stats.find_one_and_update(
+            {"userId": user_id}, update,
+            projection={"_id": 0}, upsert=True, return_document=ReturnDocument.AFTER,
+        )
+    except DuplicateKeyError:
+        # Lost a race to create the document; it exists now
+        stats = await db.prediction_stats.find_one_and_update(
+            {"userId": user_id}, update,
+            projection={"_id": 0}, return_document=ReturnDocument.AFTER,
+        )
+
+    if stats.get("currentStreak", 0) > stats.get("bestStreak", 0):
+        await db.prediction_stats.update_one(
+            {"userId": user_id},
+            {"$max": {"bestStreak": stats["currentStreak"]}}
+        )
+        stats["bestStreak"] = stats["currentStreak"]
+    return stats
+
+
+async def get_prediction_stats(user_id: str) -> dict:
+    """Point lookup of a user's stats (empty stats for users who never predicted)."""
+    db = get_db()
+    stats = await db.prediction_stats.find_one({"userId": user_id}, {"_id": 0})
+    return stats or empty_stats(user_id)
@@ -0,0 +1,70 @@
+"""Live price book - last known quote per symbol with change notifications."""
+import logging
+from typing import Callable, Dict, Iterable, List
+
+from ..config import settings
+from ..database import get_db
+from .alpha_vantage import get_quote, get_metadata_for_alpha
+
+logger = logging.getLogger(__name__)
+
+# Quote fields tracked for change detection and streamed to clients
+PRICE_FIELDS = ("currentPrice", "change")
+
+
+class PriceBook:
+    """Holds the latest quote per symbol and notifies listeners of changed fields."""
+
+    def __init__(self):
+        self.quotes: Dict[str, dict] = {}
+        self._listeners: List[Callable[[str, dict, dict], None]] = []
+
+    def add_listener(self, callback: Callable[[str, dict, dict], None]):
+        """Register callback(symbol, changed_fields, source_fields); called synchronously."""
+        self._listeners.append(callback)
+
+    def update(self, symbol: str, fields: dict) -> dict:
+        """Merge new quote fields for a symbol; returns only the fields that changed."""
+        current = self.quotes.setdefault(symbol, {})
+        changed = {
+            k: fields[k] for k in PRICE_FIELDS
+            if k in fields and current.get(k) != fields[k]
+        }
+        if not changed:
+            return changed
+
+        current.update(changed)
+        for callback in self._listeners:
+            try:
+                callback(symbol, changed, fields)
+            except Exception as e:
+                logger.error(f"Price listener failed for {symbol}: {e}")
+        return changed
+
+    def snapshot(self, symbols: Iterable[str]) -> Dict[str, dict]:
+        """Current quotes for the given symbols (unknown symbols are omitted)."""
+        return {s: dict(self.quotes[s]) for s in symbols if s in self.quotes}
+
+
+price_book = PriceBook()
+
+
+async def refresh_prices() -> int:
+    """Pull the latest quotes into the price book; returns the number of symbols changed."""
+    changed = 0
+    if settings.ALPHA_VANTAGE_API_KEY:
+        # get_quote is cached, so this costs at most one API call per symbol per TTL
+        for meta in get_metadata_for_alpha():
+            quote = await get_quote(meta["alpha_symbol"])
+            if quote and price_book.update(meta["symbol"], quote):
+                changed += 1
+        return changed
+
+    db = get_db()
+    cursor = db.stocks.find(
+        {}, {"_id": 0, "symbol": 1, "name": 1, "sector": 1, "currentPrice": 1, "change": 1}
+    )
+    async for stock in cursor:
+        if price_book.update(stock["symbol"], stock):
+            changed += 1
+    return changed
@@ -0,0 +1,177 @@
+"""Pub/sub bus delivering WebSocket broadcasts to every worker process."""
+import asyncio
+import inspect
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid
+
+from ..config import settings
+from ..database import get_db
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process on the bus; events it published are not delivered back to it
+NODE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class PubSubBus:
+    """
+    Channel -> handlers registry with local delivery.
+
+    publish() hands the payload to this process's handlers straight away;
+    cluster-wide backends also forward it to the other processes.
+    """
+
+    def __init__(self):
+        self.handlers: Dict[str, List[Callable]] = {}
+        self.published = 0
+        self.received = 0
+
+    def subscribe(self, channel: str, handler: Callable):
+        """Register a handler(payload), sync or async, for a channel."""
+        self.handlers.setdefault(channel, []).append(handler)
+
+    async def _deliver(self, channel: str, payload: dict):
+        for handler in self.handlers.get(channel, []):
+            try:
+                result = handler(payload)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Pub/sub handler for {channel} failed: {e}")
+
+    async def publish(self, channel: str, payload: dict):
+        self.published += 1
+        await self._deliver(channel, payload)
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    def metrics(self) -> dict:
+        return {
+            "backend": "memory",
+            "node": NODE_ID,
+            "published": self.published,
+            "received": self.received,
+        }
+
+
+class MongoPubSubBus(PubSubBus):
+    """
+    Cluster-wide bus over a capped collection tailed by every process.
+
+    Works on a standalone server or a replica set (no change streams
+    needed). Each event records the publishing node so it is delivered
+    locally once, by publish(), and to everyone else by their tailers.
+    """
+
+    COLLECTION = "pubsub_events"
+
+    def __init__(self, capped_bytes: int):
+        super().__init__()
+        self.capped_bytes = capped_bytes
+        self.failed = 0
+        self._ready = False
+        self._task = None
+
+    async def _ensure_collection(self, db):
+        if self._ready:
+            return
+        try:
+            await db.create_collection(self.COLLECTION, capped=True, size=self.capped_bytes)
+        except CollectionInvalid:
+            pass  # Already exists
+        self._ready = True
+
+    async def publish(self, channel: str, payload: dict):
+        """Deliver locally, then forward; a failed forward is logged, not raised."""
+        await super().publish(channel, payload)
+        try:
+            db = get_db()
+            # Publishing may come before start() (e.g. from seeding); an insert must not create it uncapped
+            await self._ensure_collection(db)
+            await db[self.COLLECTION].insert_one({
+                "channel": channel,
+                "payload": payload,
+                "origin": NODE_ID,
+                "publishedAt": datetime.now(timezone.utc).isoformat(),
+            })
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Pub/sub publish to {channel} failed: {e}")
+
+    async def _tail(self):
+        """
+        Deliver events from other nodes in insertion ($natural) order.
+
+        ObjectIds from different processes are not monotonic, so a restarted
+        cursor resumes by position: it rescans the collection and skips up
+        to the last event seen. If that event has already been evicted from
+        the capped collection, everything left is newer and is delivered.
+        """
+        db = get_db()
+        collection = db[self.COLLECTION]
+        # Start after whatever is already in the collection
+        last = await collection.find_one({}, {"_id": 1}, sort=[("$natural", -1)])
+        last_id = last["_id"] if last else None
+
+        while True:
+            if last_id is not None and await collection.find_one({"_id": last_id}, {"_id": 1}) is None:
+                logger.warning("Pub/sub resume point was evicted; events may have been missed")
+                last_id = None
+            skipping = last_id is not None
+            cursor = collection.find({}, cursor_type=CursorType.TAILABLE_AWAIT)
+            try:
+                async for event in cursor:
+                    if skipping:
+                        skipping = event["_id"] != last_id
+                        continue
+                    last_id = event["_id"]
+                    if event.get("origin") == NODE_ID:
+                        continue
+                    self.received += 1
+                    await self._deliver(event["channel"], event["payload"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Pub/sub tail failed, restarting: {e}")
+            # A tailable cursor dies on an empty collection or after errors; retry shortly
+            await asyncio.sleep(1)
+
+    async def start(self):
+        await self._ensure_collection(get_db())
+        if self._task is None:
+            self._task = asyncio.create_task(self._tail())
+        logger.info(f"Pub/sub: tailing {self.COLLECTION} as {NODE_ID}")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def metrics(self) -> dict:
+        return {**super().metrics(), "backend": "mongo", "failed": self.failed}
+
+
+def create_bus() -> PubSubBus:
+    if settings.PUBSUB_BACKEND == "mongo":
+        return MongoPubSubBus(settings.PUBSUB_CAPPED_BYTES)
+    if settings.PUBSUB_BACKEND != "memory":
+        logger.warning(f"Unknown PUBSUB_BACKEND {settings.PUBSUB_BACKEND!r}, using memory")
+    return PubSubBus()
+
+
+bus = create_bus()
@@ -0,0 +1,158 @@
+"""Token-bucket rate limiting with idle-key eviction and an optional shared backend."""
+import logging
+import math
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone, timedelta
+from typing import List, Tuple
+
+from pymongo import ReturnDocument
+
+from ..config import settings
+from ..database import get_db
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketLimiter:
+    """
+    Per-key token buckets held in process memory.
+
+    Each key may spend up to `burst` tokens at once; tokens refill at `rate`
+    per second. Buckets live in an OrderedDict in last-use order, so idle
+    keys are evicted from the front in amortized O(1). A bucket idle for
+    longer than it takes to refill completely is indistinguishable from a
+    new one, so eviction never loosens a limit.
+    """
+
+    backend = "memory"
+
+    def __init__(self, name: str, rate: float, burst: float, idle_seconds: float):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.idle_seconds = max(idle_seconds, burst / rate if rate > 0 else idle_seconds)
+        self.buckets: "OrderedDict[str, list]" = OrderedDict()
+        self.allowed = 0
+        self.limited = 0
+        self.evicted = 0
+
+    def _evict(self, now: float):
+        while self.buckets:
+            key, (_, updated) = next(iter(self.buckets.items()))
+            if now - updated < self.idle_seconds:
+                break
+            del self.buckets[key]
+            self.evicted += 1
+
+    def _take(self, key: str, cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.monotonic()
+        self._evict(now)
+
+        bucket = self.buckets.pop(key, None)
+        if bucket is None:
+            tokens = self.burst
+        else:
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+            self.allowed += 1
+        else:
+            self.limited += 1
+        self.buckets[key] = [tokens, now]
+
+        retry_after = 0.0 if allowed else (cost - tokens) / self.rate if self.rate > 0 else math.inf
+        return allowed, retry_after
+
+    async def allow(self, key: str, cost: float = 1.0) -> Tuple[bool, float]:
+        """Spend `cost` tokens for key; returns (allowed, seconds until it would be allowed)."""
+        return self._take(key, cost)
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the bucket table."""
+        size = sys.getsizeof(self.buckets)
+        for key, bucket in self.buckets.items():
+            size += sys.getsizeof(key) + sys.getsizeof(bucket) + sum(sys.getsizeof(v) for v in bucket)
+        return size
+
+    def metrics(self) -> dict:
+        return {
+            "name": self.name,
+            "backend": self.backend,
+            "rate": self.rate,
+            "burst": self.burst,
+            "idleSeconds": self.idle_seconds,
+            "keys": len(self.buckets),
+            "memoryBytes": self.memory_bytes(),
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "evicted": self.evicted,
+        }
+
+
+class MongoTokenBucketLimiter(TokenBucketLimiter):
+    """
+    Token buckets shared by every worker, one document per key.
+
+    The refill-and-spend step is a single atomic pipeline update, so
+    concurrent workers cannot both spend the last token. A TTL index on
+    expiresAt evicts idle keys. If the database is unavailable the local
+    in-memory buckets are used instead (limits then hold per process).
+    """
+
+    backend = "mongo"
+    COLLECTION = "rate_limits"
+
+    async def allow(self, key: str, cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.time()
+        elapsed = {"$max": [0, {"$subtract": [now, {"$ifNull": ["$updated", now]}]}]}
+        refilled = {"$min": [self.burst, {"$add": [{"$ifNull": ["$tokens", self.burst]}, {"$multiply": [elapsed, self.rate]}]}]}
+        pipeline = [
+            {"$set": {"tokens": refilled}},
+            {"$set": {"allowed": {"$gte": ["$tokens", cost]}}},
+            {"$set": {
+                "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", cost]}, "$tokens"]},
+                "updated": now,
+                "expiresAt": datetime.now(timezone.utc) + timedelta(seconds=self.idle_seconds),
+            }},
+        ]
+        try:
+            bucket = await get_db()[self.COLLECTION].find_one_and_update(
+                {"_id": f"{self.name}:{key}"},
+                pipeline,
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except Exception as e:
+            logger.warning(f"Shared rate limit unavailable, using local buckets: {e}")
+            return self._take(key, cost)
+
+        if bucket["allowed"]:
+            self.allowed += 1
+            return True, 0.0
+        self.limited += 1
+        retry_after = (cost - bucket["tokens"]) / self.rate if self.rate > 0 else math.inf
+        return False, retry_after
+
+
+# Every limiter created, for the admin metrics endpoint
+limiters: List[TokenBucketLimiter] = []
+
+
+def create_limiter(name: str, rate: float, burst: float) -> TokenBucketLimiter:
+    """Limiter on the configured backend (RATE_LIMIT_BACKEND)."""
+    cls = MongoTokenBucketLimiter if settings.RATE_LIMIT_BACKEND == "mongo" else TokenBucketLimiter
+    limiter = cls(name, rate, burst, settings.RATE_LIMIT_IDLE_SECONDS)
+    limiters.append(limiter)
+    return limiter
+
+
+def rate_limit_metrics() -> List[dict]:
+    return [limiter.metrics() for limiter in limiters]
+
+
+chat_limiter = create_limiter("chat", settings.CHAT_RATE_PER_SECOND, settings.CHAT_RATE_BURST)
+api_limiter = create_limiter("api", settings.API_RATE_PER_SECOND, settings.API_RATE_BURST)
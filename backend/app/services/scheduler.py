@@ -0,0 +1,151 @@
+"""In-process asyncio job scheduler for periodic background work."""
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """A named coroutine run every `interval` seconds, with duration metrics."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable],
+        interval: float,
+        jitter: float = 0.0,
+        initial_delay: float = 0.0,
+        once: bool = False,
+    ):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.initial_delay = initial_delay
+        self.once = once
+
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms: Optional[float] = None
+        self.last_started: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    def next_delay(self) -> float:
+        """Interval spread by +/- jitter (a fraction) so workers do not fire in lockstep."""
+        if not self.jitter:
+            return self.interval
+        return max(0.0, self.interval * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def metrics(self) -> dict:
+        return {
+            "name": self.name,
+            "interval": self.interval,
+            "once": self.once,
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "lastStarted": self.last_started,
+            "lastMs": self.last_ms,
+            "avgMs": round(self.total_ms / self.runs, 2) if self.runs else None,
+            "maxMs": self.max_ms,
+            "lastError": self.last_error,
+        }
+
+
+class JobScheduler:
+    """
+    Runs registered jobs on their own asyncio tasks.
+
+    A job never overlaps itself: a tick or manual trigger that arrives while
+    the previous run is still going is counted as skipped. Failures are
+    logged and recorded; the job keeps its schedule.
+    """
+
+    def __init__(self):
+        self.jobs: Dict[str, Job] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[], Awaitable],
+        interval: float = 0.0,
+        jitter: float = 0.0,
+        initial_delay: float = 0.0,
+        once: bool = False,
+    ) -> Job:
+        job = Job(name, func, interval, jitter, initial_delay, once)
+        self.jobs[name] = job
+        return job
+
+    async def run_job(self, job: Job) -> bool:
+        """Run a job now unless it is already running; returns whether it ran."""
+        if job.running:
+            job.skipped += 1
+            return False
+        job.running = True
+        job.last_started = datetime.now(timezone.utc).isoformat()
+        started = time.perf_counter()
+        try:
+            await job.func()
+            job.last_error = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            logger.error(f"Job {job.name} failed: {e}")
+        finally:
+            elapsed = round((time.perf_counter() - started) * 1000, 2)
+            job.running = False
+            job.runs += 1
+            job.last_ms = elapsed
+            job.total_ms += elapsed
+            job.max_ms = max(job.max_ms, elapsed)
+        return True
+
+    async def _loop(self, job: Job):
+        if job.initial_delay:
+            await asyncio.sleep(job.initial_delay)
+        while True:
+            await self.run_job(job)
+            if job.once:
+                return
+            await asyncio.sleep(job.next_delay())
+
+    def trigger(self, name: str) -> bool:
+        """Start a run of a job in the background; False if it is already running."""
+        job = self.jobs[name]
+        if job.running:
+            job.skipped += 1
+            return False
+        task = asyncio.create_task(self.run_job(job))
+        self._tasks.append(task)
+        task.add_done_callback(lambda t: t in self._tasks and self._tasks.remove(t))
+        return True
+
+    def start(self):
+        for job in self.jobs.values():
+            self._tasks.append(asyncio.create_task(self._loop(job)))
+        logger.info(f"Scheduler started: {', '.join(self.jobs)}")
+
+    async def stop(self):
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def metrics(self) -> List[dict]:
+        return [job.metrics() for job in self.jobs.values()]
+
+
+scheduler = JobScheduler()
@@ -0,0 +1,275 @@
+"""Rolling sector sentiment - hourly/daily buckets maintained on news writes."""
+import logging
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from ..config import settings
+from ..database import get_db
+from ..utils.http_cache import content_versions
+
+logger = logging.getLogger(__name__)
+
+# Granularity -> (bucket format, step, pattern a well-formed bucket matches)
+GRANULARITIES = {
+    "hour": ("%Y-%m-%dT%H", timedelta(hours=1), r"^\d{4}-\d{2}-\d{2}T\d{2}$"),
+    "day": ("%Y-%m-%d", timedelta(days=1), r"^\d{4}-\d{2}-\d{2}$"),
+}
+DAY_PATTERN = GRANULARITIES["day"][2]
+
+VERSION_KEY = "sector-sentiment"
+
+
+def _label(score: float) -> str:
+    return "Bullish" if score > 0.6 else ("Bearish" if score < 0.4 else "Neutral")
+
+
+def _buckets(item: dict) -> List[Tuple[str, str]]:
+    """
+    (granularity, bucket) pairs a news item counts towards.
+
+    The article date picks the day; the hour comes from ingestedAt when the
+    item was ingested on its publication day, else midnight. Items whose
+    day is not a valid YYYY-MM-DD date count towards nothing.
+    """
+    day = item.get("date") or (item.get("ingestedAt") or "")[:10]
+    if not isinstance(day, str) or not re.match(DAY_PATTERN, day):
+        return []
+    try:
+        datetime.strptime(day, "%Y-%m-%d")
+    except ValueError:
+        return []
+    ingested = item.get("ingestedAt") or ""
+    hour = ingested[:13] if ingested[:10] == day else f"{day}T00"
+    return [("day", day), ("hour", hour)]
+
+
+def _bucket_counts(items: List[dict]) -> Dict[tuple, list]:
+    counts: Dict[tuple, list] = {}
+    for item in items:
+        sentiment = item.get("sentiment")
+        if not sentiment or item.get("duplicateOf"):
+            continue
+        sector = item.get("sector") or "Other"
+        for granularity, bucket in _buckets(item):
+            entry = counts.setdefault((granularity, sector, bucket), [0, 0.0])
+            entry[0] += 1
+            entry[1] += sentiment["score"]
+    return counts
+
+
+async def record_sentiment(items: List[dict]):
+    """Fold scored, canonical news items into their buckets with one bulk $inc upsert."""
+    counts = _bucket_counts(items)
+    if not counts:
+        return
+    db = get_db()
+    touched_at = datetime.now(timezone.utc).isoformat()
+    await db.sector_sentiment.bulk_write([
+        UpdateOne(
+            {"_id": f"{granularity}:{sector}:{bucket}"},
+            {
+                "$inc": {"count": count, "sum": total},
+                "$max": {"touchedAt": touched_at},
+                "$setOnInsert": {"granularity": granularity, "sector": sector, "bucket": bucket},
+            },
+            upsert=True,
+        )
+        for (granularity, sector, bucket), (count, total) in counts.items()
+    ], ordered=False)
+    content_versions.bump(VERSION_KEY)
+
+
+def _bucket_stages(started: str) -> list:
+    """Aggregation equivalent of _buckets/_bucket_counts, ending in a $merge."""
+    day = {"$cond": [
+        {"$in": ["$date", [None, ""]]},
+        {"$substrCP": [{"$ifNull": ["$ingestedAt", ""]}, 0, 10]},
+        "$date",
+    ]}
+    return [
+        {"$match": {"sentiment": {"$exists": True}, "duplicateOf": None}},
+        {"$project": {
+            "_id": 0,
+            "sector": {"$cond": [{"$in": ["$sector", [None, ""]]}, "Other", "$sector"]},
+            "score": "$sentiment.score",
+            "day": day,
+            "ingested": {"$ifNull": ["$ingestedAt", ""]},
+        }},
+        # Same check as _buckets, minus calendar validity (_window skips such buckets)
+        {"$match": {"$expr": {"$cond": [
+            {"$eq": [{"$type": "$day"}, "string"]},
+            {"$regexMatch": {"input": "$day", "regex": DAY_PATTERN}},
+            False,
+        ]}}},
+        {"$set": {"hour": {"$cond": [
+            {"$eq": [{"$substrCP": ["$ingested", 0, 10]}, "$day"]},
+            {"$substrCP": ["$ingested", 0, 13]},
+            {"$concat": ["$day", "T00"]},
+        ]}}},
+        {"$project": {
+            "sector": 1,
+            "score": 1,
+            "buckets": [
+                {"granularity": "day", "bucket": "$day"},
+                {"granularity": "hour", "bucket": "$hour"},
+            ],
+        }},
+        {"$unwind": "$buckets"},
+        {"$group": {
+            "_id": {"$concat": ["$buckets.granularity", ":", "$sector", ":", "$buckets.bucket"]},
+            "granularity": {"$first": "$buckets.granularity"},
+            "sector": {"$first": "$sector"},
+            "bucket": {"$first": "$buckets.bucket"},
+            "count": {"$sum": 1},
+            "sum": {"$sum": "$score"},
+        }},
+        {"$set": {"touchedAt": started}},
+        {"$merge": {"into": "sector_sentiment", "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ]
+
+
+async def rebuild_sector_sentiment() -> int:
+    """
+    Recompute every bucket from stored news (backfill, or after a re-score).
+
+    Bucketing runs in the database and $merge replaces buckets in place, so
+    readers never see an empty collection and concurrent rebuilds converge
+    on the same documents. Buckets neither rebuilt nor written by
+    record_sentiment since the rebuild started no longer have any news and
+    are removed. Returns the number of buckets.
+    """
+    db = get_db()
+    started = datetime.now(timezone.utc).isoformat()
+    await db.news.aggregate(_bucket_stages(started)).to_list(None)
+    await db.sector_sentiment.delete_many({
+        "$or": [{"touchedAt": {"$lt": started}}, {"touchedAt": {"$exists": False}}]
+    })
+    content_versions.bump(VERSION_KEY)
+    buckets = await db.sector_sentiment.count_documents({})
+    logger.info(f"Sector sentiment rebuilt: {buckets} buckets")
+    return buckets
+
+
+async def ensure_sector_sentiment():
+    """Backfill the buckets once if the collection is empty."""
+    db = get_db()
+    if await db.sector_sentiment.find_one({}, {"_id": 1}) is None:
+        await rebuild_sector_sentiment()
+
+
+class WindowCache:
+    """
+    Computed windows shared by all requests in this process.
+
+    An entry is reused until the bucket version changes or it is older than
+    SECTOR_SENTIMENT_CACHE_SECONDS (which bounds staleness for writes made
+    by other workers).
+    """
+
+    def __init__(self):
+        self._entries: Dict[tuple, tuple] = {}
+
+    def get(self, key: tuple):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        version, expires, value = entry
+        if version != content_versions.version(VERSION_KEY) or time.monotonic() > expires:
+            return None
+        return value
+
+    def put(self, key: tuple, value):
+        expires = time.monotonic() + settings.SECTOR_SENTIMENT_CACHE_SECONDS
+        self._entries[key] = (content_versions.version(VERSION_KEY), expires, value)
+
+
+window_cache = WindowCache()
+
+
+async def _window(granularity: str, points: int, sector: Optional[str]) -> Tuple[List[str], List[dict]]:
+    """
+    Bucket labels and documents of the last `points` buckets.
+
+    Windows are anchored to the latest bucket that has data rather than the
+    clock, so sparse feeds still show their most recent activity. Malformed
+    buckets (stored before dates were validated) are never the anchor.
+    """
+    db = get_db()
+    fmt, step, pattern = GRANULARITIES[granularity]
+    anchor = None
+    cursor = db.sector_sentiment.find(
+        {"granularity": granularity, "bucket": {"$regex": pattern}}, {"_id": 0, "bucket": 1}
+    ).sort("bucket", -1)
+    async for latest in cursor:
+        try:
+            anchor = datetime.strptime(latest["bucket"], fmt)
+            break
+        except ValueError:
+            continue
+    if anchor is None:
+        return [], []
+
+    labels = [(anchor - step * i).strftime(fmt) for i in range(points - 1, -1, -1)]
+    query = {"granularity": granularity, "bucket": {"$gte": labels[0], "$lte": labels[-1]}}
+    if sector:
+        query["sector"] = sector
+    docs = await db.sector_sentiment.find(query, {"_id": 0}).to_list(None)
+    return labels, docs
+
+
+async def get_sector_strip(days: int = None) -> List[dict]:
+    """Average sentiment per sector over the latest `days` daily buckets."""
+    days = days or settings.SECTOR_SENTIMENT_WINDOW_DAYS
+    key = ("strip", days)
+    cached = window_cache.get(key)
+    if cached is not None:
+        return cached
+
+    _, docs = await _window("day", days, None)
+    totals: Dict[str, list] = {}
+    for doc in docs:
+        entry = totals.setdefault(doc["sector"], [0, 0.0])
+        entry[0] += doc["count"]
+        entry[1] += doc["sum"]
+
+    strip = []
+    for sector, (count, total) in sorted(totals.items()):
+        score = round(total / count, 2)
+        strip.append({"sector": sector, "score": score, "label": _label(score), "count": count})
+
+    window_cache.put(key, strip)
+    return strip
+
+
+async def get_sentiment_trend(granularity: str, points: int, sector: Optional[str] = None) -> dict:
+    """Per-sector series of average sentiment and volume, zero-filled over the window."""
+    key = ("trend", granularity, points, sector)
+    cached = window_cache.get(key)
+    if cached is not None:
+        return cached
+
+    labels, docs = await _window(granularity, points, sector)
+    by_sector: Dict[str, Dict[str, dict]] = {}
+    for doc in docs:
+        by_sector.setdefault(doc["sector"], {})[doc["bucket"]] = doc
+
+    series = []
+    for name, buckets in sorted(by_sector.items()):
+        points_out = []
+        for label in labels:
+            doc = buckets.get(label)
+            count = doc["count"] if doc else 0
+            points_out.append({
+                "bucket": label,
+                "count": count,
+                "score": round(doc["sum"] / count, 2) if count else None,
+            })
+        series.append({"sector": name, "points": points_out})
+
+    trend = {"granularity": granularity, "buckets": labels, "series": series}
+    window_cache.put(key, trend)
+    return trend
@@ -0,0 +1,168 @@
+"""Compiled lexicon sentiment scorer."""
+import hashlib
+import json
+import logging
+import re
+from typing import Dict, Iterable, List, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Original keyword lists; every term weighs 1.0, so default scores are unchanged
+DEFAULT_POSITIVE = [
+    "growth", "profit", "surge", "rally", "bullish", "strong",
+    "gain", "rise", "positive", "record", "high"
+]
+DEFAULT_NEGATIVE = [
+    "fall", "crash", "bearish", "loss", "decline", "drop",
+    "weak", "risk", "negative", "sell", "low"
+]
+
+# Bounded per-word result cache; cleared wholesale when full
+_WORD_CACHE_SIZE = 50000
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """
+    Build a regex alternation factored as a trie.
+
+    Matching at a position walks one branch per character instead of trying
+    every term in turn, so cost grows with term length, not lexicon size.
+    """
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def render(node: dict) -> str:
+        end = "" in node
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            body = "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+
+class SentimentScorer:
+    """
+    Lexicon scorer compiled once into a single trie regex.
+
+    A word counts as positive (negative) with the largest positive
+    (negative) weight of any term it contains, matching the original
+    substring semantics. Per-word results are cached, so scoring a text is
+    one pass over its words with dictionary lookups.
+    """
+
+    def __init__(self, terms: Dict[str, float], name: str = "default"):
+        self.terms = {t.lower(): float(w) for t, w in terms.items() if t and w}
+        digest = hashlib.sha1(json.dumps(sorted(self.terms.items())).encode()).hexdigest()[:10]
+        self.version = f"{name}-{digest}"
+        # Lookahead capture finds every term start, including overlapping terms
+        self._pattern = re.compile("(?=(" + _trie_pattern(self.terms) + "))") if self.terms else None
+        self._word_cache: Dict[str, tuple] = {}
+
+    def _score_word(self, word: str) -> tuple:
+        cached = self._word_cache.get(word)
+        if cached is not None:
+            return cached
+
+        positive = negative = 0.0
+        if self._pattern is not None:
+            for match in self._pattern.finditer(word):
+                term = match.group(1)
+                # The trie is greedy; shorter terms sharing this start are prefixes of it
+                for end in range(len(term), 0, -1):
+                    weight = self.terms.get(term[:end])
+                    if weight is None:
+                        continue
+                    if weight > 0:
+                        positive = max(positive, weight)
+                    else:
+                        negative = max(negative, -weight)
+
+        result = (positive, negative)
+        if len(self._word_cache) >= _WORD_CACHE_SIZE:
+            self._word_cache.clear()
+        self._word_cache[word] = result
+        return result
+
+    def score(self, text: str) -> dict:
+        """Score one text; same output format as analyze_sentiment."""
+        positive_count = negative_count = 0.0
+        for word in text.lower().split():
+            positive, negative = self._score_word(word)
+            positive_count += positive
+            negative_count += negative
+
+        total_count = positive_count + negative_count
+
+        if total_count == 0:
+            return {
+                "score": 0.5,
+                "label": "Neutral",
+                "confidence": 40
+            }
+
+        sentiment_score = positive_count / total_count
+
+        if sentiment_score > 0.6:
+            label = "Bullish"
+        elif sentiment_score < 0.4:
+            label = "Bearish"
+        else:
+            label = "Neutral"
+
+        confidence = round(min(50 + total_count * 10, 95))
+
+        return {
+            "score": round(sentiment_score, 2),
+            "label": label,
+            "confidence": confidence
+        }
+
+    def score_batch(self, texts: Iterable[str]) -> List[dict]:
+        """Score many texts, sharing the word cache."""
+        return [self.score(text) for text in texts]
+
+
+def load_lexicon(path: str) -> SentimentScorer:
+    """
+    Load a weighted lexicon from JSON.
+
+    Format: {"name": "finance-v2", "terms": {"growth": 1.0, "crash": -2.0}}.
+    Positive weights are bullish terms, negative weights bearish ones.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    return SentimentScorer(data["terms"], name=data.get("name", "custom"))
+
+
+def _default_scorer() -> SentimentScorer:
+    if settings.SENTIMENT_LEXICON_PATH:
+        try:
+            scorer = load_lexicon(settings.SENTIMENT_LEXICON_PATH)
+            logger.info(f"Sentiment lexicon {scorer.version}: {len(scorer.terms)} terms")
+            return scorer
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Could not load sentiment lexicon, using default: {e}")
+    terms = {t: 1.0 for t in DEFAULT_POSITIVE}
+    terms.update({t: -1.0 for t in DEFAULT_NEGATIVE})
+    return SentimentScorer(terms)
+
+
+_scorer: Optional[SentimentScorer] = None
+
+
+def get_scorer() -> SentimentScorer:
+    """Process-wide scorer, compiled on first use."""
+    global _scorer
+    if _scorer is None:
+        _scorer = _default_scorer()
+    return _scorer
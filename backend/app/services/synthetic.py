@@ -0,0 +1,270 @@
+"""Synthetic market data - vectorized GBM generator for scale testing."""
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS = 252
+
+# Symbols generated per pass; bounds peak memory of the temporaries
+_CHUNK_SYMBOLS = 256
+
+DEFAULT_SECTORS = [
+    "Energy", "Technology", "Banking", "FMCG", "Telecom",
+    "Pharma", "Consumer", "Industrials", "Materials", "Utilities",
+]
+
+
+class SyntheticMarket:
+    """Columnar OHLCV panel: every price array is shaped (days, symbols)."""
+
+    def __init__(self, symbols, sectors, dates, open_, high, low, close, volume, seed=None):
+        self.symbols = symbols
+        self.sectors = sectors
+        self.dates = dates
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.seed = seed
+
+    @property
+    def n_days(self) -> int:
+        return self.close.shape[0]
+
+    @property
+    def n_symbols(self) -> int:
+        return self.close.shape[1]
+
+    def close_series(self) -> Dict[str, np.ndarray]:
+        """Map symbol -> close series, the input format of the backtester."""
+        return {symbol: self.close[:, j] for j, symbol in enumerate(self.symbols)}
+
+
+def generate_market(
+    n_symbols: int = 500,
+    years: float = 10,
+    seed: Optional[int] = None,
+    sectors: Optional[List[str]] = None,
+    market_correlation: float = 0.25,
+    sector_correlation: float = 0.35,
+    calm_vol: float = 0.25,
+    turbulent_vol: float = 0.55,
+    regime_switch_prob: float = 0.01,
+    end_date: Optional[str] = None,
+) -> SyntheticMarket:
+    """
+    Generate a correlated multi-sector market with geometric Brownian motion.
+
+    Shocks follow a one-factor-per-sector model: every symbol loads on a
+    market factor and its sector factor, so symbols in the same sector have
+    correlation market_correlation + sector_correlation. Each sector flips
+    between a calm and a turbulent volatility regime (annualised vols).
+    Paths are drawn as whole arrays, a chunk of symbols at a time; the same
+    seed always yields the same market.
+    """
+    if market_correlation + sector_correlation >= 1:
+        raise ValueError("market_correlation + sector_correlation must be below 1")
+
+    sectors = sectors or DEFAULT_SECTORS
+    n_days = max(2, int(round(years * TRADING_DAYS)))
+    n_sectors = len(sectors)
+    n_chunks = -(-n_symbols // _CHUNK_SYMBOLS)
+
+    # Shared factors come from one stream, each symbol chunk from its own,
+    # so output depends only on the seed and not on memory-driven chunking.
+    factor_seq, *chunk_seqs = np.random.SeedSequence(seed).spawn(1 + n_chunks)
+    rng = np.random.default_rng(factor_seq)
+
+    # Business-day calendar ending at end_date (default: today)
+    end = np.datetime64(end_date or datetime.now(timezone.utc).strftime("%Y-%m-%d"), "D")
+    dates = np.busday_offset(end, -np.arange(n_days)[::-1], roll="backward")
+
+    # Balanced sector membership
+    sector_idx = rng.permutation(np.arange(n_symbols) % n_sectors)
+
+    # Volatility regimes per sector: 0 = calm, 1 = turbulent
+    switches = rng.random((n_days, n_sectors)) < regime_switch_prob
+    regime = np.cumsum(switches, axis=0) % 2
+    sector_vol = np.where(regime == 1, turbulent_vol, calm_vol) / np.sqrt(TRADING_DAYS)
+
+    market_factor = np.sqrt(market_correlation) * rng.standard_normal((n_days, 1))
+    sector_factor = np.sqrt(sector_correlation) * rng.standard_normal((n_days, n_sectors))
+    idio_weight = np.sqrt(1 - market_correlation - sector_correlation)
+
+    # Per-symbol vol scaling, drift, starting price and liquidity
+    vol_scale = rng.uniform(0.6, 1.4, n_symbols)
+    mu = rng.normal(0.08, 0.06, n_symbols) / TRADING_DAYS
+    start_price = rng.lognormal(np.log(800), 0.9, n_symbols)
+    base_volume = rng.lognormal(np.log(1_500_000), 0.8, n_symbols)
+
+    open_ = np.empty((n_days, n_symbols))
+    high = np.empty((n_days, n_symbols))
+    low = np.empty((n_days, n_symbols))
+    close = np.empty((n_days, n_symbols))
+    volume = np.empty((n_days, n_symbols), dtype=np.int64)
+
+    for k, lo in enumerate(range(0, n_symbols, _CHUNK_SYMBOLS)):
+        hi = min(lo + _CHUNK_SYMBOLS, n_symbols)
+        crng = np.random.default_rng(chunk_seqs[k])
+        cols = slice(lo, hi)
+        width = hi - lo
+        chunk_sectors = sector_idx[cols]
+
+        # Correlated unit-variance shocks
+        shocks = idio_weight * crng.standard_normal((n_days, width))
+        shocks += market_factor
+        shocks += sector_factor[:, chunk_sectors]
+
+        sigma = sector_vol[:, chunk_sectors] * vol_scale[cols]
+        log_returns = (mu[cols] - 0.5 * sigma ** 2) + sigma * shocks
+        c = start_price[cols] * np.exp(np.cumsum(log_returns, axis=0))
+
+        # Open gaps from the previous close; high/low extend beyond the body
+        prev_close = np.vstack([start_price[None, cols], c[:-1]])
+        o = prev_close * np.exp(0.25 * sigma * crng.standard_normal((n_days, width)))
+        high[:, cols] = np.round(
+            np.maximum(o, c) * np.exp(0.5 * sigma * np.abs(crng.standard_normal((n_days, width)))), 2
+        )
+        low[:, cols] = np.round(
+            np.minimum(o, c) * np.exp(-0.5 * sigma * np.abs(crng.standard_normal((n_days, width)))), 2
+        )
+        open_[:, cols] = np.round(o, 2)
+        close[:, cols] = np.round(c, 2)
+
+        # Volume rises with the size of the move and in turbulent regimes
+        activity = 1 + 25 * np.abs(log_returns) + 0.5 * regime[:, chunk_sectors]
+        volume[:, cols] = base_volume[cols] * activity * crng.lognormal(0, 0.25, (n_days, width))
+
+    symbols = [f"SYN{j:05d}" for j in range(n_symbols)]
+
+    return SyntheticMarket(
+        symbols=symbols,
+        sectors=[sectors[i] for i in sector_idx],
+        dates=dates,
+        open_=open_,
+        high=high,
+        low=low,
+        close=close,
+        volume=volume,
+        seed=seed,
+    )
+
+
+def _market_cap_label(price: float, volume: float) -> str:
+    """Rough market cap label in lakh crore, matching the seeded stocks."""
+    crore = price * volume * 50 / 1e7
+    if crore >= 1e5:
+        return f"{crore / 1e5:.1f}L Cr"
+    return f"{crore:,.0f} Cr"
+
+
+def to_stock_documents(market: SyntheticMarket, history_days: Optional[int] = None) -> List[dict]:
+    """
+    Convert a market into documents shaped like the stocks collection.
+
+    `history_days` keeps only the most recent bars in historicalData so
+    decades of history stay well below the Mongo document size limit.
+    """
+    first = 0 if not history_days else max(0, market.n_days - history_days)
+    dates = np.datetime_as_string(market.dates[first:], unit="D").tolist()
+
+    # Column-wise tolist() is far cheaper than per-element numpy scalar access
+    opens = market.open[first:].T.tolist()
+    highs = market.high[first:].T.tolist()
+    lows = market.low[first:].T.tolist()
+    closes = market.close[first:].T.tolist()
+    volumes = market.volume[first:].T.tolist()
+
+    last = market.close[-1]
+    prev = market.close[-2]
+    change = np.round((last / prev - 1) * 100, 2).tolist()
+    avg_volume = market.volume[-20:].mean(axis=0).tolist()
+
+    documents = []
+    for j, symbol in enumerate(market.symbols):
+        documents.append({
+            "id": str(uuid.uuid4()),
+            "symbol": symbol,
+            "name": f"Synthetic {market.sectors[j]} {symbol}",
+            "sector": market.sectors[j],
+            "currentPrice": float(last[j]),
+            "change": change[j],
+            "marketCap": _market_cap_label(float(last[j]), avg_volume[j]),
+            "synthetic": True,
+            "historicalData": [
+                {"date": d, "open": o, "high": h, "low": lo, "close": c, "volume": v}
+                for d, o, h, lo, c, v in zip(dates, opens[j], highs[j], lows[j], closes[j], volumes[j])
+            ],
+        })
+    return documents
+
+
+async def populate_mongo(
+    db,
+    market: SyntheticMarket,
+    history_days: Optional[int] = None,
+    replace: bool = True,
+    batch_size: int = 100,
+) -> int:
+    """Insert a synthetic market into the stocks collection; returns documents written."""
+    if replace:
+        result = await db.stocks.delete_many({"synthetic": True})
+        logger.info("Removed %d previous synthetic stocks", result.deleted_count)
+
+    written = 0
+    for i in range(0, market.n_symbols, batch_size):
+        # Convert per batch so the full document list never sits in memory
+        part = SyntheticMarket(
+            symbols=market.symbols[i:i + batch_size],
+            sectors=market.sectors[i:i + batch_size],
+            dates=market.dates,
+            open_=market.open[:, i:i + batch_size],
+            high=market.high[:, i:i + batch_size],
+            low=market.low[:, i:i + batch_size],
+            close=market.close[:, i:i + batch_size],
+            volume=market.volume[:, i:i + batch_size],
+            seed=market.seed,
+        )
+        documents = to_stock_documents(part, history_days)
+        await db.stocks.insert_many(documents, ordered=False)
+        written += len(documents)
+    return written
+
+
+def save_npz(market: SyntheticMarket, path: str):
+    """Write a market to a compressed columnar .npz history store."""
+    np.savez_compressed(
+        path,
+        symbols=np.array(market.symbols),
+        sectors=np.array(market.sectors),
+        dates=market.dates,
+        open=market.open,
+        high=market.high,
+        low=market.low,
+        close=market.close,
+        volume=market.volume,
+        seed=np.array(-1 if market.seed is None else market.seed),
+    )
+
+
+def load_npz(path: str) -> SyntheticMarket:
+    """Read a market written by save_npz."""
+    with np.load(path) as data:
+        seed = int(data["seed"])
+        return SyntheticMarket(
+            symbols=data["symbols"].tolist(),
+            sectors=data["sectors"].tolist(),
+            dates=data["dates"],
+            open_=data["open"],
+            high=data["high"],
+            low=data["low"],
+            close=data["close"],
+            volume=data["volume"],
+            seed=None if seed < 0 else seed,
+        )
@@ -0,0 +1,252 @@
+"""Write-behind buffer for append-only collections."""
+import asyncio
+import logging
+import time
+from typing import Dict, List
+
+from pymongo.errors import BulkWriteError
+
+from ..config import settings
+from ..database import get_db
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+
+
+class CollectionStats:
+    def __init__(self):
+        self.buffered = 0
+        self.written = 0
+        self.batches = 0
+        self.max_batch = 0
+        self.last_batch = 0
+        self.total_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.last_flush_ms = None
+        self.failures = 0
+        self.retried = 0
+        self.dropped = 0
+        self.sync_writes = 0
+
+    def to_dict(self, pending: int) -> dict:
+        return {
+            "pending": pending,
+            "buffered": self.buffered,
+            "written": self.written,
+            "batches": self.batches,
+            "avgBatch": round(self.written / self.batches, 1) if self.batches else None,
+            "maxBatch": self.max_batch,
+            "lastBatch": self.last_batch,
+            "avgFlushMs": round(self.total_flush_ms / self.batches, 2) if self.batches else None,
+            "maxFlushMs": self.max_flush_ms,
+            "lastFlushMs": self.last_flush_ms,
+            "failures": self.failures,
+            "retried": self.retried,
+            "dropped": self.dropped,
+            "syncWrites": self.sync_writes,
+        }
+
+
+class WriteBehindBuffer:
+    """
+    Accumulates inserts for opted-in collections and writes them in batches.
+
+    A batch is flushed with insert_many(ordered=False) every flush_ms, or
+    sooner once a collection has max_batch records waiting. When a flush
+    fails outright (database unreachable) its records are kept and flushes
+    back off exponentially, up to max_backoff_ms, until one succeeds.
+    Records rejected individually are retried up to max_retries times;
+    records already written come back as duplicate keys and are treated as
+    written. Records are only dropped (and logged) when re-queued failures
+    push the buffer past max_pending. Collections that are not opted in,
+    or a buffer that is over max_pending, write through synchronously.
+    stop() drains everything still pending.
+    """
+
+    def __init__(
+        self, collections, flush_ms: int, max_batch: int, max_retries: int, max_pending: int,
+        max_backoff_ms: int,
+    ):
+        self.collections = set(collections)
+        self.flush_interval = flush_ms / 1000
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.max_pending = max_pending
+        self.max_backoff = max_backoff_ms / 1000
+        self.pending: Dict[str, List[tuple]] = {}
+        self.stats: Dict[str, CollectionStats] = {}
+        # Consecutive flushes that failed outright; drives the backoff
+        self.failed_flushes = 0
+        self._wake = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._task = None
+
+    def _stats(self, collection: str) -> CollectionStats:
+        stats = self.stats.get(collection)
+        if stats is None:
+            stats = self.stats[collection] = CollectionStats()
+        return stats
+
+    def _pending_total(self) -> int:
+        return sum(len(p) for p in self.pending.values())
+
+    async def insert(self, collection: str, record: dict):
+        """Insert a record now, or queue it if the collection is buffered."""
+        if collection not in self.collections or self._task is None or self._pending_total() >= self.max_pending:
+            self._stats(collection).sync_writes += 1
+            # A copy either way, so the caller's dict never gains an _id
+            await get_db()[collection].insert_one(dict(record))
+            return
+
+        queue = self.pending.setdefault(collection, [])
+        queue.append((dict(record), 0))  # (document, attempts)
+        self._stats(collection).buffered += 1
+        if len(queue) >= self.max_batch:
+            self._wake.set()
+
+    async def _flush_collection(self, collection: str, entries: List[tuple]) -> bool:
+        """Write one batch and re-queue rejected records; False if the whole batch failed."""
+        stats = self._stats(collection)
+        docs = [doc for doc, _ in entries]
+        started = time.perf_counter()
+        rejected: List[int] = []
+        unreachable = False
+        try:
+            await get_db()[collection].insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            rejected = [
+                err["index"] for err in e.details.get("writeErrors", [])
+                if err.get("code") != DUPLICATE_KEY
+            ]
+        except Exception as e:
+            logger.error(f"Write-behind flush of {len(docs)} {collection} records failed, keeping them: {e}")
+            unreachable = True
+
+        elapsed = round((time.perf_counter() - started) * 1000, 2)
+        stats.batches += 1
+        stats.last_batch = len(docs)
+        stats.max_batch = max(stats.max_batch, len(docs))
+        stats.last_flush_ms = elapsed
+        stats.total_flush_ms += elapsed
+        stats.max_flush_ms = max(stats.max_flush_ms, elapsed)
+
+        if unreachable:
+            # Not the records' fault: flush() keeps them all without spending their retries
+            stats.failures += 1
+            stats.retried += len(entries)
+            return False
+
+        stats.written += len(docs) - len(rejected)
+        if rejected:
+            stats.failures += 1
+            retry = []
+            for i in rejected:
+                doc, attempts = entries[i]
+                if attempts + 1 >= self.max_retries:
+                    stats.dropped += 1
+                else:
+                    retry.append((doc, attempts + 1))
+            if retry:
+                stats.retried += len(retry)
+                self._requeue(collection, retry)
+            if len(retry) < len(rejected):
+                logger.error(f"Write-behind dropped {len(rejected) - len(retry)} {collection} records rejected {self.max_retries} times")
+        return True
+
+    def _requeue(self, collection: str, entries: List[tuple]):
+        """Put failed records back in front; drop the oldest ones if that overflows the buffer."""
+        queue = self.pending.setdefault(collection, [])
+        queue[:0] = entries
+        overflow = self._pending_total() - self.max_pending
+        if overflow > 0:
+            overflow = min(overflow, len(queue))
+            del queue[:overflow]
+            self._stats(collection).dropped += overflow
+            logger.error(f"Write-behind buffer full: dropped {overflow} oldest {collection} records")
+
+    def _backoff(self) -> float:
+        """Seconds to wait before the next flush after consecutive failures."""
+        return min(self.max_backoff, self.flush_interval * (2 ** self.failed_flushes))
+
+    async def flush(self) -> bool:
+        """
+        Write out everything currently pending, one batch per collection.
+
+        Returns False if a batch failed outright; the rest of the buffer is
+        then left for the next flush rather than sent to a failing database.
+        """
+        pending, self.pending = self.pending, {}
+        ok = True
+        for collection, entries in pending.items():
+            kept: List[tuple] = []
+            for i in range(0, len(entries), self.max_batch):
+                batch = entries[i:i + self.max_batch]
+                if not ok or not await self._flush_collection(collection, batch):
+                    ok = False
+                    kept.extend(batch)
+            if kept:
+                self._requeue(collection, kept)
+        self.failed_flushes = 0 if ok else self.failed_flushes + 1
+        return ok
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            if self.failed_flushes:
+                # Backing off: a full batch does not cut this short, only stop() does
+                event, timeout = self._stopping, self._backoff()
+            else:
+                event, timeout = self._wake, self.flush_interval
+            try:
+                await asyncio.wait_for(event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if self.pending and not self._stopping.is_set():
+                await self.flush()
+
+    def start(self):
+        if self._task is None and self.collections:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Write-behind enabled for: {', '.join(sorted(self.collections))}")
+
+    async def stop(self):
+        """Stop the flush loop and drain pending records."""
+        if self._task is not None:
+            # Not cancelled: a flush in progress finishes (and re-queues its failures) first
+            self._stopping.set()
+            self._wake.set()
+            await self._task
+            self._task = None
+        for _ in range(self.max_retries):
+            if not self.pending:
+                break
+            await self.flush()
+        if self.pending:
+            for collection, entries in self.pending.items():
+                self._stats(collection).dropped += len(entries)
+                logger.error(f"Write-behind dropped {len(entries)} {collection} records at shutdown")
+            self.pending = {}
+
+    def metrics(self) -> dict:
+        return {
+            "collections": sorted(self.collections),
+            "flushMs": round(self.flush_interval * 1000),
+            "failedFlushes": self.failed_flushes,
+            "maxBatch": self.max_batch,
+            "byCollection": {
+                name: stats.to_dict(len(self.pending.get(name, [])))
+                for name, stats in self.stats.items()
+            },
+        }
+
+
+write_behind = WriteBehindBuffer(
+    settings.write_behind_collections_list,
+    settings.WRITE_BEHIND_FLUSH_MS,
+    settings.WRITE_BEHIND_MAX_BATCH,
+    settings.WRITE_BEHIND_MAX_RETRIES,
+    settings.WRITE_BEHIND_MAX_PENDING,
+    settings.WRITE_BEHIND_MAX_BACKOFF_MS,
+)
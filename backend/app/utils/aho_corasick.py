@@ -0,0 +1,75 @@
+"""Aho-Corasick multi-pattern matcher."""
+from collections import deque
+from typing import Dict, Generic, Iterator, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class AhoCorasick(Generic[T]):
+    """
+    Automaton matching every pattern of a dictionary in one pass over the text.
+
+    Patterns map to a value returned with each match. With whole_words,
+    matches must start and end at word boundaries (so "itc" does not match
+    inside "switch").
+    """
+
+    def __init__(self, patterns: Dict[str, T], whole_words: bool = True):
+        self.whole_words = whole_words
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (pattern length, value) of every pattern ending here
+        self._out: List[List[Tuple[int, T]]] = [[]]
+
+        for pattern, value in patterns.items():
+            if pattern:
+                self._add(pattern, value)
+        self._build()
+
+    def _add(self, pattern: str, value: T):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), value))
+
+    def _build(self):
+        """Breadth-first failure links; outputs inherit their failure state's outputs."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def _boundary(self, text: str, start: int, end: int) -> bool:
+        before = start == 0 or not text[start - 1].isalnum()
+        after = end == len(text) or not text[end].isalnum()
+        return before and after
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, T]]:
+        """Yield (start, end, value) for every pattern occurrence."""
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, value in out[state]:
+                start = i + 1 - length
+                if not self.whole_words or self._boundary(text, start, i + 1):
+                    yield start, i + 1, value
+
+    def values_in(self, text: str) -> set:
+        """Distinct values of all patterns found in text."""
+        return {value for _, _, value in self.iter_matches(text)}
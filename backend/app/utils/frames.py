@@ -0,0 +1,15 @@
+"""WebSocket frame encoding - serialize once, send the same text to every socket."""
+import json
+
+try:
+    import orjson
+except ImportError:  # listed in requirements; the stdlib encoder covers bare installs
+    orjson = None
+
+
+def encode_frame(data) -> str:
+    """Encode a frame payload as compact JSON text, equivalent to what send_json would send."""
+    if orjson is not None:
+        # Non-string keys are stringified, as json.dumps does
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
@@ -0,0 +1,130 @@
+"""Content versioning for conditional GET (ETag / Last-Modified)."""
+import asyncio
+import hashlib
+import logging
+import uuid
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Iterable
+
+from pymongo import UpdateOne
+
+from ..config import settings
+from ..database import get_db
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def _aware(value: datetime) -> datetime:
+    """Mongo returns naive UTC datetimes unless the client is tz-aware."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class ContentVersions:
+    """
+    Version counters for cacheable content, bumped whenever the data changes.
+
+    ETags are derived from the versions alone, so a request can be answered
+    with 304 before any handler work. The versions are shared through the
+    content_versions collection: bump() counts locally, and a sync loop
+    $inc's the pending counts into Mongo and reads back everyone's versions,
+    so changes made by other workers and by the CLI move the tags too.
+    Until a local bump is synced, its tag carries a per-process suffix so it
+    cannot collide with a tag issued elsewhere.
+    """
+
+    COLLECTION = "content_versions"
+
+    def __init__(self, sync_seconds: float):
+        self.sync_seconds = sync_seconds
+        self._node = uuid.uuid4().hex
+        self._started = _now()
+        self._shared: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}
+        self._modified: Dict[str, datetime] = {}
+        self._task = None
+
+    def bump(self, key: str):
+        """Mark a content key as changed."""
+        self._pending[key] = self._pending.get(key, 0) + 1
+        self._modified[key] = _now()
+
+    def version(self, key: str) -> int:
+        return self._shared.get(key, 0) + self._pending.get(key, 0)
+
+    def etag(self, keys: Iterable[str], scope: str = "") -> str:
+        """Strong ETag for the current versions of `keys` (scope: e.g. the request path and query)."""
+        parts = [scope]
+        for k in keys:
+            parts.append(f"{k}:{self._shared.get(k, 0)}")
+            if self._pending.get(k):
+                parts.append(f"{self._node}:{self._pending[k]}")
+        return '"' + hashlib.sha1("|".join(parts).encode()).hexdigest()[:24] + '"'
+
+    def last_modified(self, keys: Iterable[str]) -> datetime:
+        """Most recent change time across `keys`."""
+        return max([self._modified.get(k, self._started) for k in keys] or [self._started])
+
+    def last_modified_header(self, keys: Iterable[str]) -> str:
+        return format_datetime(self.last_modified(keys), usegmt=True)
+
+    async def sync(self):
+        """Push pending bumps to Mongo and adopt the shared versions."""
+        collection = get_db()[self.COLLECTION]
+        pushed = dict(self._pending)
+        if pushed:
+            await collection.bulk_write([
+                UpdateOne(
+                    {"_id": key},
+                    {"$inc": {"version": count}, "$max": {"modifiedAt": self._modified[key]}},
+                    upsert=True,
+                )
+                for key, count in pushed.items()
+            ], ordered=False)
+        docs = await collection.find({}).to_list(None)
+
+        # No awaits from here on: pending and shared change together
+        for key, count in pushed.items():
+            remaining = self._pending.get(key, 0) - count
+            if remaining > 0:
+                self._pending[key] = remaining
+            else:
+                self._pending.pop(key, None)
+        for doc in docs:
+            key = doc["_id"]
+            self._shared[key] = max(self._shared.get(key, 0), doc.get("version", 0))
+            if doc.get("modifiedAt"):
+                self._modified[key] = max(self._modified.get(key, self._started), _aware(doc["modifiedAt"]))
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.error(f"Content version sync failed: {e}")
+            await asyncio.sleep(self.sync_seconds)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the sync loop and push any remaining bumps."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.sync()
+        except Exception as e:
+            logger.error(f"Content version sync failed: {e}")
+
+
+content_versions = ContentVersions(settings.CONTENT_VERSION_SYNC_SECONDS)
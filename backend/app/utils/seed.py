@@ -4,8 +4,13 @@ import logging
 from datetime import datetime, timezone, timedelta
 
 from ..database import get_db
+from .http_cache import content_versions
 from ..services.auth import hash_password
-from ..services.market import generate_stock_history, analyze_sentiment, calculate_impact_score
+from ..services.market import generate_stock_history
+from ..services.entities import link_news_items
+from ..services.news import fingerprint_news_item, score_news_items
+from ..services.sector_sentiment import record_sentiment
+from ..services.alerts import create_alerts, notify_holdings_changed
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +68,7 @@ async def seed_demo_data():
     ]
     
     await db.assets.insert_many(assets)
+    await notify_holdings_changed(demo_user_id)
     
     # Educational lessons with quizzes
     lessons = [
@@ -155,25 +161,16 @@ async def seed_demo_data():
         {"id": str(uuid.uuid4()), "title": "Telecom Sector Record Growth", "content": "India telecom companies report record data consumption growth and strong subscriber gain with positive revenue trends.", "sector": "Telecom", "date": "2024-01-10"},
     ]
     
+    for news_item in news:
+        fingerprint_news_item(news_item)
+    score_news_items(news)
+    link_news_items(news)
     await db.news.insert_many(news)
+    await record_sentiment(news)
+    content_versions.bump("news")
     
     # Generate alerts from high-impact news
-    for news_item in news:
-        impact = calculate_impact_score(news_item)
-        if impact >= 75:
-            sentiment = analyze_sentiment(news_item.get("content", ""))
-            severity = "High" if impact >= 85 else "Medium"
-            
-            await db.alerts.insert_one({
-                "id": str(uuid.uuid4()),
-                "title": news_item["title"],
-                "impact_score": impact,
-                "impacted_sectors": [news_item.get("sector", "General")],
-                "severity": severity,
-                "explanation": f"{sentiment['label']} sentiment in {news_item.get('sector', 'market')} sector. Confidence: {sentiment['confidence']}%.",
-                "created_at": datetime.now(timezone.utc).isoformat(),
-                "is_read": False
-            })
+    await create_alerts(news, broadcast=False)
     
     # Community chat messages
     community_messages = [
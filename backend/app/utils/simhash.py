@@ -0,0 +1,110 @@
+"""64-bit SimHash fingerprints with a banded index for near-duplicate lookup."""
+import hashlib
+import itertools
+import re
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+BITS = 64
+BLOCKS = 8
+BLOCK_BITS = BITS // BLOCKS
+# Each band key is a pair of blocks; see bands()
+MAX_GUARANTEED_DISTANCE = BLOCKS - 2
+SHINGLE = 3
+
+_WORD = re.compile(r"\w+")
+
+
+def _features(text: str) -> Dict[str, int]:
+    """
+    Character shingles of the normalized text, with counts.
+
+    News items are short; character shingles keep a one-word edit from
+    flipping as many bits as word features would.
+    """
+    normalized = " ".join(_WORD.findall(text.lower()))
+    features: Dict[str, int] = {}
+    for i in range(len(normalized) - SHINGLE + 1):
+        shingle = normalized[i:i + SHINGLE]
+        features[shingle] = features.get(shingle, 0) + 1
+    return features
+
+
+def simhash(text: str) -> int:
+    """
+    64-bit SimHash of a text.
+
+    Each feature hash votes +weight or -weight on every bit position; the
+    fingerprint keeps the sign. Similar texts share most features, so their
+    fingerprints differ in few bits.
+    """
+    features = _features(text)
+    if not features:
+        return 0
+
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "big") for f in features],
+        dtype=">u8",
+    )
+    weights = np.fromiter(features.values(), dtype=np.int64, count=len(features))
+    # One row of 64 bits per feature, most significant bit first
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1).astype(np.int64)
+    votes = weights @ (2 * bits - 1)
+
+    fingerprint = 0
+    for vote in votes:
+        fingerprint = (fingerprint << 1) | int(vote > 0)
+    return fingerprint
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def bands(fingerprint: int) -> List[str]:
+    """
+    Band keys of a fingerprint: every pair of its BLOCKS 8-bit blocks.
+
+    Two fingerprints within MAX_GUARANTEED_DISTANCE bits differ in at most
+    that many blocks, so at least two blocks - and hence one pair key -
+    match exactly. An equality lookup on the keys finds every candidate at
+    that distance, while 16-bit keys keep buckets small.
+    """
+    mask = (1 << BLOCK_BITS) - 1
+    blocks = [(fingerprint >> (i * BLOCK_BITS)) & mask for i in range(BLOCKS)]
+    return [
+        f"{i}{j}:{blocks[i]:02x}{blocks[j]:02x}"
+        for i, j in itertools.combinations(range(BLOCKS), 2)
+    ]
+
+
+def to_hex(fingerprint: int) -> str:
+    return f"{fingerprint:016x}"
+
+
+def from_hex(value: str) -> int:
+    return int(value, 16)
+
+
+class BandIndex:
+    """In-memory band index over a small set of fingerprints (one ingestion batch)."""
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max_distance
+        self._buckets: Dict[str, List[tuple]] = {}
+
+    def add(self, key: str, fingerprint: int, band_keys: Optional[Iterable[str]] = None):
+        for band in band_keys or bands(fingerprint):
+            self._buckets.setdefault(band, []).append((key, fingerprint))
+
+    def find(self, fingerprint: int, band_keys: Optional[Iterable[str]] = None) -> Optional[str]:
+        """Key of the closest indexed fingerprint within max_distance, if any."""
+        best = None
+        best_distance = self.max_distance + 1
+        for band in band_keys or bands(fingerprint):
+            for key, other in self._buckets.get(band, ()):
+                distance = hamming(fingerprint, other)
+                if distance < best_distance:
+                    best, best_distance = key, distance
+        return best
@@ -3,9 +3,19 @@ import jwt
 from fastapi import WebSocket, WebSocketDisconnect
 from ..config import settings
 from ..database import get_db
+from ..services.alerts import SEVERITY_LEVELS
 from ..websockets.managers import alert_manager
 
 
+def _parse_names(value) -> list:
+    """Normalize a list (or single string) of names from a filter message."""
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    return [v.strip() for v in value if isinstance(v, str) and v.strip()]
+
+
 async def authenticate_websocket(websocket: WebSocket):
     """Authenticate WebSocket connection via query param token."""
     token = websocket.query_params.get("token")
@@ -30,18 +40,74 @@ async def authenticate_websocket(websocket: WebSocket):
         return None
 
 
+async def apply_alert_filter(websocket: WebSocket, user_id: str, data: dict):
+    """
+    Register a connection's alert filter and echo back what was applied.
+
+    holdings adds the sectors and symbols of the user's assets. A filter
+    left with no sectors and no symbols (e.g. holdings with an empty
+    portfolio) matches every alert; the echo says so with matchesAll.
+    """
+    min_severity = data.get("minSeverity") if data.get("minSeverity") in SEVERITY_LEVELS else "Medium"
+    sectors = {s.lower() for s in _parse_names(data.get("sectors"))}
+    symbols = {s.upper() for s in _parse_names(data.get("symbols"))}
+    held = 0
+    if data.get("holdings"):
+        db = get_db()
+        assets = await db.assets.find({"userId": user_id}, {"_id": 0, "symbol": 1, "sector": 1}).to_list(None)
+        held = len(assets)
+        symbols.update(a["symbol"].upper() for a in assets if isinstance(a.get("symbol"), str))
+        sectors.update(a["sector"].lower() for a in assets if isinstance(a.get("sector"), str) and a["sector"])
+    
+    limit = settings.ALERT_FILTER_MAX_KEYS
+    sectors = sorted(sectors)[:limit]
+    symbols = sorted(symbols)[:max(0, limit - len(sectors))]
+    alert_manager.set_filter(websocket, SEVERITY_LEVELS[min_severity], sectors, symbols, request=data)
+    alert_manager.send(websocket, {
+        "type": "filter",
+        "data": {
+            "minSeverity": min_severity,
+            "sectors": sectors,
+            "symbols": symbols,
+            "holdings": bool(data.get("holdings")),
+            "heldAssets": held,
+            "matchesAll": not sectors and not symbols,
+        }
+    }, droppable=False)
+
+
+async def refresh_holdings_filters(payload: dict):
+    """Bus handler for the holdings channel: rebuild holdings filters after a portfolio change."""
+    user_id = payload.get("userId")
+    for websocket, request in alert_manager.holdings_filters(user_id):
+        await apply_alert_filter(websocket, user_id, request)
+
+
 async def alerts_websocket_handler(websocket: WebSocket):
-    """Handle WebSocket connections for alerts."""
+    """
+    Handle WebSocket connections for alerts.
+
+    Clients may send {"action": "filter", "minSeverity": "Medium" | "High",
+    "sectors": [...], "symbols": [...], "holdings": true} to receive only
+    matching alerts (holdings adds the sectors and symbols in the user's
+    portfolio, and follows it as assets change).
+    An alert matches when it is at least minSeverity and, if any sectors
+    or symbols are given, touches one of them.
+    """
     user = await authenticate_websocket(websocket)
     
     if not user:
         return
     
-    await alert_manager.connect(websocket, user["id"])
+    if not await alert_manager.connect(websocket, user["id"]):
+        return
     
     try:
-        # Keep connection alive
         while True:
-            await websocket.receive_text()
+            data = await alert_manager.receive(websocket)
+            if data is not None and data.get("action") == "filter":
+                await apply_alert_filter(websocket, user["id"], data)
     except WebSocketDisconnect:
+        pass
+    finally:
         alert_manager.disconnect(websocket, user["id"])
@@ -1,64 +1,93 @@
 """WebSocket endpoint for community chat."""
-import json
+import math
 import uuid
 from datetime import datetime, timezone
 from fastapi import WebSocket, WebSocketDisconnect
-from ..database import get_db
+from ..services.chat_history import chat_history, normalize_room
+from ..services.pubsub import bus
+from ..services.rate_limit import chat_limiter
+from ..services.write_behind import write_behind
 from ..websockets.managers import chat_manager
 from ..websockets.alerts import authenticate_websocket
 
 
-last_message_times = {}
+def _rate_limited(retry_after: float) -> dict:
+    """Error frame telling the client how long to wait."""
+    wait = max(1, math.ceil(retry_after))
+    return {"type": "error", "data": f"Rate limited. Wait {wait} second{'s' if wait != 1 else ''}."}
 
 
 async def chat_websocket_handler(websocket: WebSocket):
-    """Handle WebSocket connections for community chat."""
+    """
+    Handle WebSocket connections for community chat.
+
+    The connection starts in the room given by ?room= (default "general");
+    rooms are "general" plus one per sector and per stock symbol.
+    Clients send {"action": "join" | "leave", "room": ...} to change rooms
+    and {"message": ..., "room": ...} to post; a join is answered with the
+    room's recent history, and messages only reach the room's members.
+    """
     user = await authenticate_websocket(websocket)
     
     if not user:
         return
     
-    await chat_manager.connect(websocket)
+    room = normalize_room(websocket.query_params.get("room"))
+    if room is None:
+        await websocket.close(code=4000, reason="Invalid room")
+        return
+    
+    if not await chat_manager.connect(websocket, user["id"], room):
+        return
     
     try:
-        db = get_db()
-        
-        # Send recent message history
-        recent_messages = await db.community_chat.find(
-            {},
-            {"_id": 0}
-        ).sort("timestamp", -1).limit(50).to_list(50)
-        
-        await websocket.send_json({
-            "type": "history",
-            "data": list(reversed(recent_messages))
-        })
+        # Send recent message history (pre-encoded, from memory)
+        chat_manager.send(websocket, chat_history.history_frame(room), droppable=False)
         
         # Handle incoming messages
         while True:
-            raw_data = await websocket.receive_text()
-            data = json.loads(raw_data)
+            data = await chat_manager.receive(websocket)
+            if data is None:
+                continue
             
-            message_text = data.get("message", "").strip()
+            room = normalize_room(data.get("room"))
+            if room is None:
+                chat_manager.send(websocket, {"type": "error", "data": "Unknown room."}, droppable=False)
+                continue
+            
+            action = data.get("action")
+            if action == "join":
+                # Joins spend tokens too (on their own key), since each one is answered with history
+                allowed, retry_after = await chat_limiter.allow(f"join:{user['id']}")
+                if not allowed:
+                    chat_manager.send(websocket, _rate_limited(retry_after), droppable=False)
+                elif chat_manager.join(websocket, room):
+                    chat_manager.send(websocket, chat_history.history_frame(room), droppable=False)
+                else:
+                    chat_manager.send(websocket, {"type": "error", "data": "Too many rooms joined."}, droppable=False)
+                continue
+            if action == "leave":
+                chat_manager.leave(websocket, room)
+                chat_manager.send(websocket, {"type": "left", "room": room}, droppable=False)
+                continue
+            
+            message_text = str(data.get("message", "")).strip()
             
             # Validate message
             if not message_text or len(message_text) > 500:
                 continue
+            if not chat_manager.is_member(websocket, room):
+                chat_manager.send(websocket, {"type": "error", "data": "Join the room before posting."}, droppable=False)
+                continue
             
-            # Rate limiting: 2 seconds between messages
-            now = datetime.now(timezone.utc)
+            # Rate limiting: token bucket per user (short bursts, then a steady rate)
             user_id = user["id"]
+            allowed, retry_after = await chat_limiter.allow(user_id)
+            if not allowed:
+                chat_manager.send(websocket, _rate_limited(retry_after), droppable=False)
+                continue
             
-            if user_id in last_message_times:
-                time_diff = (now - last_message_times[user_id]).total_seconds()
-                if time_diff < 2:
-                    await websocket.send_json({
-                        "type": "error",
-                        "data": "Rate limited. Wait 2 seconds."
-                    })
-                    continue
-            
-            last_message_times[user_id] = now
+            now = datetime.now(timezone.utc)
             
             # Save message to database
             record = {
@@ -66,16 +95,19 @@ async def chat_websocket_handler(websocket: WebSocket):
                 "userId": user_id,
                 "username": user["name"],
                 "message": message_text,
+                "room": room,
                 "timestamp": now.isoformat()
             }
             
-            await db.community_chat.insert_one(record.copy())
+            await write_behind.insert("community_chat", record)
             
-            # Broadcast to all connected clients
-            await chat_manager.broadcast({
+            # Broadcast to the room's members on every worker
+            await bus.publish("chat", {
                 "type": "message",
                 "data": record
             })
             
     except WebSocketDisconnect:
+        pass
+    finally:
         chat_manager.disconnect(websocket)
@@ -1,66 +1,637 @@
 """WebSocket connection managers."""
-from typing import Dict, List
-from fastapi import WebSocket
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
+from fastapi import WebSocket, WebSocketDisconnect
 
+from ..config import settings
+from ..services.alerts import SEVERITY_LEVELS
+from ..services.chat_history import DEFAULT_ROOM
+from ..services.prices import price_book
+from ..utils.frames import encode_frame
 
-class AlertConnectionManager:
-    """Manages WebSocket connections for alerts."""
+logger = logging.getLogger(__name__)
+
+SLOW_CONSUMER_POLICIES = ("drop_oldest", "disconnect")
+
+# Close code sent to consumers that cannot keep up ("try again later")
+CLOSE_SLOW_CONSUMER = 1013
+# Close code for connections that stopped answering heartbeats ("going away")
+CLOSE_IDLE = 1001
+# Close code for connections refused by a connection cap ("policy violation")
+CLOSE_OVER_LIMIT = 1008
+
+# Heartbeat frame; clients answer with {"type": "pong"}
+PING_FRAME = encode_frame({"type": "ping"})
+
+
+class OutboundConnection:
+    """
+    A WebSocket with a bounded outbound queue drained by its own writer task.
+
+    send() never waits on the network: it enqueues an already encoded text
+    frame, and when the queue is full the manager's slow-consumer policy
+    either drops the oldest droppable frame or disconnects the client.
+    Replies a client cannot recover without (snapshots, history, errors)
+    are queued as not droppable; a connection whose queue holds nothing
+    else is disconnected. Any drop marks the connection stale, so its
+    manager can resynchronise it. A failed write closes the connection and
+    removes it from its manager.
+    """
+    
+    def __init__(self, websocket: WebSocket, manager: "FanoutManager", on_close: Callable[[], None]):
+        self.websocket = websocket
+        self.manager = manager
+        self.on_close = on_close
+        self.frames: Deque[Tuple[str, bool]] = deque()
+        self.closed = False
+        self.stale = False
+        self.last_seen = time.monotonic()
+        self._ready = asyncio.Event()
+        self._writer = asyncio.create_task(self._write_loop())
+    
+    def send(self, frame: str, droppable: bool = True) -> bool:
+        """Enqueue an encoded frame; returns False if it was not queued."""
+        if self.closed:
+            return False
+        if len(self.frames) >= self.manager.queue_size:
+            if self.manager.policy == "disconnect" or not self._drop_oldest():
+                self.manager.slow_disconnects += 1
+                logger.info(f"{self.manager.name}: disconnecting slow consumer")
+                self.close(CLOSE_SLOW_CONSUMER)
+                return False
+        self.frames.append((frame, droppable))
+        self._ready.set()
+        return True
+    
+    def _drop_oldest(self) -> bool:
+        """Discard the oldest droppable frame; False if there is none."""
+        for i, (_, droppable) in enumerate(self.frames):
+            if droppable:
+                del self.frames[i]
+                self.manager.dropped += 1
+                self.stale = True
+                return True
+        return False
+    
+    async def _write_loop(self):
+        while True:
+            while not self.frames:
+                self._ready.clear()
+                await self._ready.wait()
+            frame, _ = self.frames.popleft()
+            try:
+                await self.websocket.send_text(frame)
+                self.manager.sent += 1
+            except Exception as e:
+                self.manager.send_errors += 1
+                logger.debug(f"{self.manager.name}: send failed, dropping connection: {e}")
+                self.close()
+                return
+    
+    def close(self, code: int = None):
+        """Stop the writer and unregister; optionally close the socket with a code."""
+        if self.closed:
+            return
+        self.closed = True
+        if asyncio.current_task() is not self._writer:
+            self._writer.cancel()
+        self.on_close()
+        if code is not None:
+            asyncio.create_task(self._close_socket(code))
+    
+    async def _close_socket(self, code: int):
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass  # Already closed
+
+
+class FanoutManager:
+    """
+    Shared outbound plumbing, liveness and metrics for the WebSocket managers.
+
+    A heartbeat loop pings every connection each WS_HEARTBEAT_SECONDS and
+    reaps those that sent nothing (no pong, no message) for
+    WS_IDLE_TIMEOUT_SECONDS, which is how half-open TCP connections are
+    noticed. New connections are refused once the user has
+    WS_MAX_CONNECTIONS_PER_USER on this manager or the process has
+    WS_MAX_CONNECTIONS across all managers.
+    """
+    
+    # Accepted connections across every manager in this process
+    live_total = 0
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.queue_size = settings.WS_SEND_QUEUE_SIZE
+        self.policy = settings.WS_SLOW_CONSUMER_POLICY
+        if self.policy not in SLOW_CONSUMER_POLICIES:
+            logger.warning(f"Unknown WS_SLOW_CONSUMER_POLICY {self.policy!r}, using drop_oldest")
+            self.policy = "drop_oldest"
+        self.heartbeat_interval = settings.WS_HEARTBEAT_SECONDS
+        self.idle_timeout = settings.WS_IDLE_TIMEOUT_SECONDS
+        self.outbound: Dict[WebSocket, OutboundConnection] = {}
+        self.owners: Dict[WebSocket, str] = {}
+        self.user_counts: Dict[str, int] = {}
+        self.sent = 0
+        self.dropped = 0
+        self.slow_disconnects = 0
+        self.send_errors = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.reaped = 0
+        self._heartbeat = None
+    
+    async def _accept(self, websocket: WebSocket, user_id: str, on_close: Callable[[], None]) -> bool:
+        """Accept and register a connection, or refuse it if a cap is reached."""
+        if (
+            self.user_counts.get(user_id, 0) >= settings.WS_MAX_CONNECTIONS_PER_USER
+            or FanoutManager.live_total >= settings.WS_MAX_CONNECTIONS
+        ):
+            self.rejected += 1
+            await websocket.close(code=CLOSE_OVER_LIMIT)
+            return False
+        # Reserve the slot before awaiting the handshake, so concurrent accepts cannot overshoot a cap
+        self.user_counts[user_id] = self.user_counts.get(user_id, 0) + 1
+        FanoutManager.live_total += 1
+        try:
+            await websocket.accept()
+        except BaseException:
+            self._unreserve(user_id)
+            raise
+        self.outbound[websocket] = OutboundConnection(websocket, self, on_close)
+        self.owners[websocket] = user_id
+        self.accepted += 1
+        return True
+    
+    def _unreserve(self, user_id: str):
+        FanoutManager.live_total -= 1
+        remaining = self.user_counts[user_id] - 1
+        if remaining:
+            self.user_counts[user_id] = remaining
+        else:
+            del self.user_counts[user_id]
+    
+    def _release(self, websocket: WebSocket):
+        connection = self.outbound.pop(websocket, None)
+        if connection is None:
+            return
+        self._unreserve(self.owners.pop(websocket))
+        connection.close()
+    
+    def send(self, websocket: WebSocket, data: Union[dict, str], droppable: bool = True) -> bool:
+        """
+        Queue a frame (a payload, or text from encode_frame) for one connection.
+
+        Pass droppable=False for replies the client cannot do without, such
+        as snapshots, history and errors.
+        """
+        connection = self.outbound.get(websocket)
+        if connection is None:
+            return False
+        return connection.send(data if isinstance(data, str) else encode_frame(data), droppable)
+    
+    async def receive(self, websocket: WebSocket) -> Optional[dict]:
+        """
+        Wait for the next client message and mark the connection alive.
+
+        Pongs are consumed here; returns None for anything that is not a
+        JSON object. Raises WebSocketDisconnect once the manager has dropped
+        the connection (reaped, slow consumer or failed write).
+        """
+        while True:
+            if websocket not in self.outbound:
+                raise WebSocketDisconnect(code=CLOSE_IDLE)
+            raw_data = await websocket.receive_text()
+            connection = self.outbound.get(websocket)
+            if connection is not None:
+                connection.last_seen = time.monotonic()
+            try:
+                data = json.loads(raw_data)
+            except ValueError:
+                return None
+            if not isinstance(data, dict):
+                return None
+            if data.get("type") != "pong":
+                return data
+    
+    def heartbeat(self):
+        """Reap connections idle past the timeout and ping the rest."""
+        deadline = time.monotonic() - self.idle_timeout
+        for connection in list(self.outbound.values()):
+            if connection.last_seen < deadline:
+                self.reaped += 1
+                connection.close(CLOSE_IDLE)
+            else:
+                connection.send(PING_FRAME)
+    
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                self.heartbeat()
+            except Exception as e:
+                logger.error(f"{self.name}: heartbeat failed: {e}")
+    
+    def start(self):
+        """Start the heartbeat loop."""
+        if self._heartbeat is None and self.heartbeat_interval > 0:
+            self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+    
+    async def stop(self):
+        """Stop the heartbeat loop."""
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat = None
+    
+    def metrics(self) -> dict:
+        depths = [len(c.frames) for c in self.outbound.values()]
+        return {
+            "name": self.name,
+            "connections": len(self.outbound),
+            "users": len(self.user_counts),
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "reaped": self.reaped,
+            "queuedFrames": sum(depths),
+            "maxQueueDepth": max(depths, default=0),
+            "queueSize": self.queue_size,
+            "policy": self.policy,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "slowDisconnects": self.slow_disconnects,
+            "sendErrors": self.send_errors,
+        }
+
+
+class AlertConnectionManager(FanoutManager):
+    """
+    Manages WebSocket connections for alerts with server-side filters.
+
+    Each connection has a minimum severity and optional sectors/symbols
+    (none means every alert). The index maps (severity level, key) to
+    connections, where key is "sector:<name>", "symbol:<SYMBOL>" or "*",
+    so publishing an alert only visits the connections it can match.
+    """
     
     def __init__(self):
-        self.connections: Dict[str, List[WebSocket]] = {}
+        super().__init__("alerts")
+        self.connections: Dict[str, Set[WebSocket]] = {}
+        self.filters: Dict[WebSocket, dict] = {}
+        self.index: Dict[tuple, Set[WebSocket]] = {}
+        self.delivered = 0
+        self.suppressed = 0
     
-    async def connect(self, websocket: WebSocket, user_id: str):
-        """Accept and store new WebSocket connection."""
-        await websocket.accept()
-        if user_id not in self.connections:
-            self.connections[user_id] = []
-        self.connections[user_id].append(websocket)
+    async def connect(self, websocket: WebSocket, user_id: str) -> bool:
+        """Accept and store new WebSocket connection; False if refused."""
+        if not await self._accept(websocket, user_id, lambda: self.disconnect(websocket, user_id)):
+            return False
+        self.connections.setdefault(user_id, set()).add(websocket)
+        self.set_filter(websocket, min(SEVERITY_LEVELS.values()))
+        return True
     
     def disconnect(self, websocket: WebSocket, user_id: str):
-        """Remove WebSocket connection."""
-        if user_id in self.connections:
-            self.connections[user_id] = [
-                ws for ws in self.connections[user_id] if ws != websocket
-            ]
-    
-    async def send_to_user(self, user_id: str, data: dict):
-        """Send data to all connections for a specific user."""
-        for websocket in self.connections.get(user_id, []):
-            try:
-                await websocket.send_json(data)
-            except:
-                pass  # Connection already closed
+        """Remove WebSocket connection and its filter."""
+        sockets = self.connections.get(user_id)
+        if sockets is not None:
+            sockets.discard(websocket)
+            if not sockets:
+                del self.connections[user_id]
+        self._unindex(websocket)
+        self._release(websocket)
     
-    async def broadcast_all(self, data: dict):
-        """Broadcast data to all connected users."""
-        for user_id in self.connections:
-            await self.send_to_user(user_id, data)
+    @staticmethod
+    def _filter_keys(alert_filter: dict) -> List[tuple]:
+        level = alert_filter["minSeverity"]
+        keys = [(level, f"sector:{s}") for s in alert_filter["sectors"]]
+        keys += [(level, f"symbol:{s}") for s in alert_filter["symbols"]]
+        return keys or [(level, "*")]
+    
+    def _unindex(self, websocket: WebSocket):
+        alert_filter = self.filters.pop(websocket, None)
+        if alert_filter is None:
+            return
+        for key in self._filter_keys(alert_filter):
+            sockets = self.index.get(key)
+            if sockets is not None:
+                sockets.discard(websocket)
+                if not sockets:
+                    del self.index[key]
+    
+    def set_filter(
+        self, websocket: WebSocket, min_level: int, sectors: Iterable[str] = (), symbols: Iterable[str] = (),
+        request: Optional[dict] = None,
+    ):
+        """
+        Replace a connection's filter (sectors lowercased, symbols uppercased by the caller).
+
+        `request` is the client's filter message, kept so filters that follow
+        the user's holdings can be rebuilt when the portfolio changes.
+        """
+        if websocket not in self.outbound:
+            return
+        self._unindex(websocket)
+        alert_filter = {"minSeverity": min_level, "sectors": set(sectors), "symbols": set(symbols), "request": request}
+        self.filters[websocket] = alert_filter
+        for key in self._filter_keys(alert_filter):
+            self.index.setdefault(key, set()).add(websocket)
+    
+    def _recipients(self, alert: dict) -> Set[WebSocket]:
+        alert_level = SEVERITY_LEVELS.get(alert.get("severity"), 0)
+        keys = ["*"]
+        keys += [f"sector:{s.lower()}" for s in alert.get("impacted_sectors", []) if isinstance(s, str)]
+        keys += [f"symbol:{s.upper()}" for s in alert.get("symbols", []) if isinstance(s, str)]
+        recipients: Set[WebSocket] = set()
+        for level in SEVERITY_LEVELS.values():
+            if level > alert_level:
+                continue
+            for key in keys:
+                recipients.update(self.index.get((level, key), ()))
+        return recipients
+    
+    def publish_alerts(self, data: dict):
+        """
+        Queue a {"type": "new_alerts"} frame holding only the alerts each
+        connection's filter matches; connections matching the same alerts
+        share one encoded frame, and those matching none get nothing.
+        """
+        alerts = data.get("data") or []
+        matched: Dict[WebSocket, List[int]] = {}
+        for i, alert in enumerate(alerts):
+            for websocket in self._recipients(alert):
+                matched.setdefault(websocket, []).append(i)
+        
+        encoded: Dict[tuple, str] = {}
+        delivered = 0
+        for websocket, indices in matched.items():
+            key = tuple(indices)
+            frame = encoded.get(key)
+            if frame is None:
+                frame = encoded[key] = encode_frame({**data, "data": [alerts[i] for i in indices]})
+            self.send(websocket, frame)
+            delivered += len(indices)
+        self.delivered += delivered
+        self.suppressed += len(alerts) * len(self.filters) - delivered
+    
+    def holdings_filters(self, user_id: str) -> List[tuple]:
+        """(websocket, filter request) for a user's connections whose filter includes holdings."""
+        found = []
+        for websocket in self.connections.get(user_id, ()):
+            request = (self.filters.get(websocket) or {}).get("request")
+            if request and request.get("holdings"):
+                found.append((websocket, request))
+        return found
+    
+    def send_to_user(self, user_id: str, data: Union[dict, str]):
+        """Queue data for all connections of a specific user."""
+        frame = data if isinstance(data, str) else encode_frame(data)
+        for websocket in list(self.connections.get(user_id, ())):
+            self.send(websocket, frame)
+    
+    def metrics(self) -> dict:
+        return {
+            **super().metrics(),
+            "filtered": sum(1 for f in self.filters.values() if f["sectors"] or f["symbols"]),
+            "indexKeys": len(self.index),
+            "alertsDelivered": self.delivered,
+            "alertsSuppressed": self.suppressed,
+        }
+
 
+class ChatConnectionManager(FanoutManager):
+    """
+    Manages WebSocket connections for community chat rooms.
 
-class ChatConnectionManager:
-    """Manages WebSocket connections for community chat."""
+    Keeps a room -> connections index alongside each connection's rooms, so
+    a broadcast only touches the members of the message's room.
+    """
     
     def __init__(self):
-        self.connections: List[WebSocket] = []
+        super().__init__("chat")
+        self.memberships: Dict[WebSocket, Set[str]] = {}
+        self.members: Dict[str, Set[WebSocket]] = {}
+    
+    async def connect(self, websocket: WebSocket, user_id: str, room: str = DEFAULT_ROOM) -> bool:
+        """Accept and store new WebSocket connection as a member of a room; False if refused."""
+        if not await self._accept(websocket, user_id, lambda: self.disconnect(websocket)):
+            return False
+        self.memberships[websocket] = set()
+        self.join(websocket, room)
+        return True
+    
+    def disconnect(self, websocket: WebSocket):
+        """Remove WebSocket connection and its room memberships."""
+        for room in self.memberships.pop(websocket, set()):
+            self._remove_member(room, websocket)
+        self._release(websocket)
+    
+    def join(self, websocket: WebSocket, room: str) -> bool:
+        """Add a connection to a room; False if unknown or at the room limit."""
+        rooms = self.memberships.get(websocket)
+        if rooms is None:
+            return False
+        if room in rooms:
+            return True
+        if len(rooms) >= settings.CHAT_MAX_ROOMS_PER_CONNECTION:
+            return False
+        rooms.add(room)
+        self.members.setdefault(room, set()).add(websocket)
+        return True
+    
+    def leave(self, websocket: WebSocket, room: str):
+        """Remove a connection from a room."""
+        rooms = self.memberships.get(websocket, set())
+        if room in rooms:
+            rooms.discard(room)
+            self._remove_member(room, websocket)
+    
+    def is_member(self, websocket: WebSocket, room: str) -> bool:
+        return room in self.memberships.get(websocket, ())
+    
+    def _remove_member(self, room: str, websocket: WebSocket):
+        sockets = self.members.get(room)
+        if sockets is not None:
+            sockets.discard(websocket)
+            if not sockets:
+                del self.members[room]
+    
+    def broadcast(self, data: dict):
+        """Queue data for the members of its room, encoded once."""
+        room = (data.get("data") or {}).get("room") or DEFAULT_ROOM
+        sockets = self.members.get(room)
+        if not sockets:
+            return
+        frame = encode_frame(data)
+        for websocket in list(sockets):
+            self.send(websocket, frame)
+    
+    def metrics(self) -> dict:
+        return {
+            **super().metrics(),
+            "rooms": len(self.members),
+            "largestRoom": max((len(s) for s in self.members.values()), default=0),
+        }
+
+
+class PriceConnectionManager(FanoutManager):
+    """
+    Manages WebSocket connections for live prices with per-symbol subscriptions.
+
+    Updates are coalesced: publish() only records the latest changed fields
+    per symbol, and a flush every frame interval sends each connection one
+    delta frame covering just the symbols it subscribed to. A connection
+    that had a frame dropped gets a full snapshot of its subscriptions in
+    the next flush instead, since its deltas no longer add up.
+    """
     
-    async def connect(self, websocket: WebSocket):
-        """Accept and store new WebSocket connection."""
-        await websocket.accept()
-        self.connections.append(websocket)
+    def __init__(self, frame_interval_ms: int):
+        super().__init__("prices")
+        self.frame_interval = frame_interval_ms / 1000
+        self.subscriptions: Dict[WebSocket, Set[str]] = {}
+        self.subscribers: Dict[str, Set[WebSocket]] = {}
+        self._pending: Dict[str, dict] = {}
+        self.resyncs = 0
+        self._task = None
+    
+    async def connect(self, websocket: WebSocket, user_id: str) -> bool:
+        """Accept and store new WebSocket connection; False if refused."""
+        if not await self._accept(websocket, user_id, lambda: self.disconnect(websocket)):
+            return False
+        self.subscriptions[websocket] = set()
+        return True
     
     def disconnect(self, websocket: WebSocket):
-        """Remove WebSocket connection."""
-        self.connections = [ws for ws in self.connections if ws != websocket]
+        """Remove WebSocket connection and all of its subscriptions."""
+        for symbol in self.subscriptions.pop(websocket, set()):
+            self._remove_subscriber(symbol, websocket)
+        self._release(websocket)
+    
+    def subscribe(self, websocket: WebSocket, symbols: Iterable[str]) -> List[str]:
+        """Subscribe a connection to symbols; returns the symbols newly added."""
+        current = self.subscriptions.get(websocket)
+        if current is None:
+            return []
+        added = []
+        for symbol in symbols:
+            if symbol in current or len(current) >= settings.PRICE_MAX_SUBSCRIPTIONS:
+                continue
+            current.add(symbol)
+            self.subscribers.setdefault(symbol, set()).add(websocket)
+            added.append(symbol)
+        return added
+    
+    def unsubscribe(self, websocket: WebSocket, symbols: Iterable[str]):
+        """Unsubscribe a connection from symbols."""
+        current = self.subscriptions.get(websocket, set())
+        for symbol in symbols:
+            if symbol in current:
+                current.discard(symbol)
+                self._remove_subscriber(symbol, websocket)
+    
+    def _remove_subscriber(self, symbol: str, websocket: WebSocket):
+        sockets = self.subscribers.get(symbol)
+        if sockets is not None:
+            sockets.discard(websocket)
+            if not sockets:
+                del self.subscribers[symbol]
+    
+    def publish(self, symbol: str, changed: dict, fields: dict = None):
+        """Queue changed fields for the next frame (PriceBook listener)."""
+        if symbol in self.subscribers:
+            self._pending.setdefault(symbol, {}).update(changed)
+    
+    def flush(self):
+        """Queue one coalesced delta frame, or a resync snapshot, for every affected connection."""
+        resynced = self._resync()
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        
+        frames: Dict[WebSocket, dict] = {}
+        for symbol, fields in pending.items():
+            for websocket in self.subscribers.get(symbol, ()):
+                if websocket not in resynced:
+                    frames.setdefault(websocket, {})[symbol] = fields
+        
+        # Connections watching the same changed symbols share one encoded frame
+        encoded: Dict[tuple, str] = {}
+        for websocket, data in frames.items():
+            key = tuple(data)
+            frame = encoded.get(key)
+            if frame is None:
+                frame = encoded[key] = encode_frame({"type": "delta", "data": data})
+            self.send(websocket, frame)
     
-    async def broadcast(self, data: dict):
-        """Broadcast data to all connected clients."""
-        for websocket in self.connections:
+    def _resync(self) -> Set[WebSocket]:
+        """Queue a current snapshot for each connection that had a frame dropped."""
+        resynced = set()
+        for websocket, connection in list(self.outbound.items()):
+            if not connection.stale:
+                continue
+            connection.stale = False
+            resynced.add(websocket)
+            self.resyncs += 1
+            # Droppable: if this one is dropped too, the connection is stale again
+            self.send(websocket, {
+                "type": "snapshot",
+                "data": price_book.snapshot(self.subscriptions.get(websocket, ()))
+            })
+        return resynced
+    
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.frame_interval)
             try:
-                await websocket.send_json(data)
-            except:
-                pass  # Connection already closed
+                self.flush()
+            except Exception as e:
+                logger.error(f"Price frame flush failed: {e}")
+    
+    def start(self):
+        """Start the heartbeat and frame flush loops."""
+        super().start()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Stop the heartbeat and frame flush loops."""
+        await super().stop()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def metrics(self) -> dict:
+        return {**super().metrics(), "resyncs": self.resyncs}
 
 
 # Global instances
 alert_manager = AlertConnectionManager()
 chat_manager = ChatConnectionManager()
+price_manager = PriceConnectionManager(settings.PRICE_FRAME_INTERVAL_MS)
+
+
+def websocket_metrics() -> List[dict]:
+    """Connection, queue depth and drop counters of every manager."""
+    return [m.metrics() for m in (alert_manager, chat_manager, price_manager)]
+
+
+def connection_limits() -> dict:
+    """Process-wide live connections against the configured caps."""
+    return {
+        "live": FanoutManager.live_total,
+        "maxConnections": settings.WS_MAX_CONNECTIONS,
+        "maxPerUser": settings.WS_MAX_CONNECTIONS_PER_USER,
+        "heartbeatSeconds": settings.WS_HEARTBEAT_SECONDS,
+        "idleTimeoutSeconds": settings.WS_IDLE_TIMEOUT_SECONDS,
+    }
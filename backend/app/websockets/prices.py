@@ -0,0 +1,53 @@
+"""WebSocket endpoint for live price streaming."""
+from fastapi import WebSocket, WebSocketDisconnect
+from ..services.prices import price_book
+from ..websockets.managers import price_manager
+from ..websockets.alerts import authenticate_websocket
+
+
+def _parse_symbols(data: dict) -> list:
+    """Normalize the symbols list of a subscribe/unsubscribe message."""
+    symbols = data.get("symbols", [])
+    if isinstance(symbols, str):
+        symbols = [symbols]
+    return [s.strip().upper() for s in symbols if isinstance(s, str) and s.strip()]
+
+
+async def prices_websocket_handler(websocket: WebSocket):
+    """
+    Handle WebSocket connections for live prices.
+
+    Clients send {"action": "subscribe" | "unsubscribe", "symbols": [...]}.
+    A subscribe is answered with a snapshot of the current quotes; after
+    that the client receives coalesced delta frames with changed fields only.
+    """
+    user = await authenticate_websocket(websocket)
+
+    if not user:
+        return
+
+    if not await price_manager.connect(websocket, user["id"]):
+        return
+
+    try:
+        while True:
+            data = await price_manager.receive(websocket)
+            if data is None:
+                continue
+
+            action = data.get("action")
+            symbols = _parse_symbols(data)
+
+            if action == "subscribe":
+                added = price_manager.subscribe(websocket, symbols)
+                price_manager.send(websocket, {
+                    "type": "snapshot",
+                    "data": price_book.snapshot(added)
+                }, droppable=False)
+            elif action == "unsubscribe":
+                price_manager.unsubscribe(websocket, symbols)
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        price_manager.disconnect(websocket)
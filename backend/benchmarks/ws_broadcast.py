@@ -0,0 +1,106 @@
+"""
+Micro-benchmark: chat broadcast cost vs connection count.
+
+Compares the previous fan-out (send_json per socket, awaited in turn, so
+the payload is serialized once per recipient) with ChatConnectionManager
+(payload encoded once, queued to per-connection writer tasks).
+
+Sockets are in-memory fakes, so the numbers are pure server-side CPU cost.
+Run from the backend directory:
+    python -m benchmarks.ws_broadcast --connections 10 100 1000 5000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from app.websockets.managers import ChatConnectionManager
+from app.utils.frames import orjson
+
+
+class FakeWebSocket:
+    """Accepts frames without I/O; send_json serializes like Starlette does."""
+
+    def __init__(self):
+        self.frames = 0
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, data):
+        json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+        self.frames += 1
+
+    async def send_text(self, text):
+        self.frames += 1
+
+    async def close(self, code=None):
+        pass
+
+
+def _payload(i: int) -> dict:
+    return {
+        "type": "message",
+        "data": {
+            "id": f"msg-{i}",
+            "userId": "c7a1f3e2-5d4b-4c8e-9f00-1a2b3c4d5e6f",
+            "username": "Priya Sharma",
+            "message": "Banking sector is holding steady. HDFC Bank looks solid for long term. " * 2,
+            "timestamp": "2024-01-10T10:15:00+00:00",
+        },
+    }
+
+
+async def _legacy_broadcast(sockets, data):
+    for websocket in sockets:
+        try:
+            await websocket.send_json(data)
+        except Exception:
+            pass
+
+
+async def bench_legacy(connections: int, messages: int) -> float:
+    sockets = [FakeWebSocket() for _ in range(connections)]
+    started = time.perf_counter()
+    for i in range(messages):
+        await _legacy_broadcast(sockets, _payload(i))
+    return time.perf_counter() - started
+
+
+async def bench_queued(connections: int, messages: int) -> float:
+    manager = ChatConnectionManager()
+    manager.queue_size = max(manager.queue_size, messages)
+    sockets = [FakeWebSocket() for _ in range(connections)]
+    for i, websocket in enumerate(sockets):
+        await manager.connect(websocket, f"user-{i}")
+
+    started = time.perf_counter()
+    for i in range(messages):
+        manager.broadcast(_payload(i))
+    # Include the time for every writer to drain its queue
+    while any(websocket.frames < messages for websocket in sockets):
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+
+    for websocket in sockets:
+        manager.disconnect(websocket)
+    return elapsed
+
+
+async def main(args):
+    print(f"encoder: {'orjson' if orjson else 'json'}; {args.messages} messages per run")
+    print(f"{'connections':>12} {'legacy ms/msg':>14} {'queued ms/msg':>14} {'speedup':>8}")
+    for connections in args.connections:
+        legacy = await bench_legacy(connections, args.messages)
+        queued = await bench_queued(connections, args.messages)
+        print(
+            f"{connections:>12} {legacy / args.messages * 1000:>14.3f} "
+            f"{queued / args.messages * 1000:>14.3f} {legacy / queued:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--connections", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--messages", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
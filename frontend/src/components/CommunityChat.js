@@ -5,7 +5,7 @@ import { Input } from '@/components/ui/input';
 import { ScrollArea } from '@/components/ui/scroll-area';
 import { Send, Users, MessageCircle } from 'lucide-react';
 
-export const CommunityChat = () => {
+export const CommunityChat = ({ room = 'general' }) => {
   const { user, token } = useAuth();
   const [messages, setMessages] = useState([]);
   const [input, setInput] = useState('');
@@ -17,21 +17,23 @@ export const CommunityChat = () => {
   useEffect(() => {
     if (!token) return;
     const wsUrl = process.env.REACT_APP_BACKEND_URL.replace('https://', 'wss://').replace('http://', 'ws://');
-    const ws = new WebSocket(`${wsUrl}/api/ws/chat?token=${token}`);
+    const ws = new WebSocket(`${wsUrl}/api/ws/chat?token=${token}&room=${encodeURIComponent(room)}`);
 
     ws.onopen = () => setConnected(true);
     ws.onclose = () => setConnected(false);
     ws.onmessage = (e) => {
       const msg = JSON.parse(e.data);
-      if (msg.type === 'history') {
+      if (msg.type === 'ping') {
+        ws.send(JSON.stringify({ type: 'pong' }));
+      } else if (msg.type === 'history' && msg.room === room) {
         setMessages(msg.data || []);
-      } else if (msg.type === 'message') {
+      } else if (msg.type === 'message' && (msg.data?.room || 'general') === room) {
         setMessages(prev => [...prev, msg.data]);
       }
     };
     wsRef.current = ws;
     return () => { ws.close(); };
-  }, [token]);
+  }, [token, room]);
 
   useEffect(() => {
     bottomRef.current?.scrollIntoView({ behavior: 'smooth' });
@@ -40,7 +42,7 @@ export const CommunityChat = () => {
   const sendMessage = () => {
     const msg = input.trim();
     if (!msg || !wsRef.current || wsRef.current.readyState !== WebSocket.OPEN) return;
-    wsRef.current.send(JSON.stringify({ message: msg }));
+    wsRef.current.send(JSON.stringify({ message: msg, room }));
     setInput('');
   };
 
@@ -9,6 +9,7 @@ export const NotificationBell = () => {
   const [alerts, setAlerts] = useState([]);
   const [unread, setUnread] = useState(0);
   const [open, setOpen] = useState(false);
+  const [filter, setFilter] = useState(null);
   const wsRef = useRef(null);
   const panelRef = useRef(null);
 
@@ -26,11 +27,22 @@ export const NotificationBell = () => {
     if (!token) return;
     const wsUrl = process.env.REACT_APP_BACKEND_URL.replace('https://', 'wss://').replace('http://', 'ws://');
     const ws = new WebSocket(`${wsUrl}/api/ws/alerts?token=${token}`);
+    ws.onopen = () => {
+      // Only alerts touching the sectors or stocks the user holds; the server follows portfolio changes
+      ws.send(JSON.stringify({ action: 'filter', holdings: true, minSeverity: 'Medium' }));
+    };
     ws.onmessage = (e) => {
       const msg = JSON.parse(e.data);
-      if (msg.type === 'new_alert') {
+      if (msg.type === 'ping') {
+        ws.send(JSON.stringify({ type: 'pong' }));
+      } else if (msg.type === 'new_alert') {
         setAlerts(prev => [msg.data, ...prev]);
         setUnread(prev => prev + 1);
+      } else if (msg.type === 'filter') {
+        setFilter(msg.data);
+      } else if (msg.type === 'new_alerts') {
+        setAlerts(prev => [...msg.data, ...prev]);
+        setUnread(prev => prev + msg.data.length);
       }
     };
     wsRef.current = ws;
@@ -90,6 +102,14 @@ export const NotificationBell = () => {
             </div>
           </div>
 
+          {filter?.holdings && (
+            <p className="px-5 py-2 text-[11px] text-gray-400 border-b border-gray-100" data-testid="alert-filter-note">
+              {filter.matchesAll
+                ? 'No holdings yet, so live alerts cover the whole market.'
+                : 'Live alerts cover the sectors and stocks you hold.'}
+            </p>
+          )}
+
           <div className="max-h-[400px] overflow-y-auto">
             {alerts.length === 0 ? (
               <div className="p-8 text-center">
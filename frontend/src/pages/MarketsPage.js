@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react';
 import api from '@/lib/api';
+import { useAuth } from '@/context/AuthContext';
 import { Button } from '@/components/ui/button';
 import { Badge } from '@/components/ui/badge';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs';
@@ -10,6 +11,7 @@ import { toast } from 'sonner';
 const HEAT_COLORS = { positive: '#10B981', negative: '#EF4444', neutral: '#F59E0B' };
 
 export default function MarketsPage() {
+  const { token } = useAuth();
   const [stocks, setStocks] = useState([]);
   const [selected, setSelected] = useState(null);
   const [stockDetail, setStockDetail] = useState(null);
@@ -39,6 +41,27 @@ export default function MarketsPage() {
     }).finally(() => setLoading(false));
   }, []);
 
+  // Live prices: subscribe once to the listed symbols and apply deltas in place
+  const symbolKey = stocks.map(s => s.symbol).join(',');
+  useEffect(() => {
+    if (!token || !symbolKey) return;
+    const wsUrl = process.env.REACT_APP_BACKEND_URL.replace('https://', 'wss://').replace('http://', 'ws://');
+    const ws = new WebSocket(`${wsUrl}/api/ws/prices?token=${token}`);
+    ws.onopen = () => ws.send(JSON.stringify({ action: 'subscribe', symbols: symbolKey.split(',') }));
+    ws.onmessage = (e) => {
+      const msg = JSON.parse(e.data);
+      if (msg.type === 'ping') {
+        ws.send(JSON.stringify({ type: 'pong' }));
+        return;
+      }
+      if (msg.type !== 'snapshot' && msg.type !== 'delta') return;
+      const updates = msg.data || {};
+      setStocks(prev => prev.map(s => (updates[s.symbol] ? { ...s, ...updates[s.symbol] } : s)));
+      setStockDetail(prev => (prev && updates[prev.symbol] ? { ...prev, ...updates[prev.symbol] } : prev));
+    };
+    return () => { ws.close(); };
+  }, [token, symbolKey]);
+
   const selectStock = async (symbol) => {
     setSelected(symbol);
     try {